@@ -9,7 +9,7 @@ import asyncio
 from sqlalchemy import text
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from elk.api.schemas import HealthResponse, ProcessResponse, TranscribeRequest
-from elk.api.middleware import setup_production_middleware
+from elk.api.middleware import setup_production_middleware, flush_logs
 from elk.api.routes import router as job_router
 from elk.database.db import init_db, async_engine
 from elk.core.config import settings
@@ -48,6 +48,7 @@ async def shutdown_event():
     """Cleanup resources."""
     if hasattr(app.state, "redis"):
         await app.state.redis.close()
+    flush_logs()
     logger.info("ELK API Shutdown.")
 
 @app.get("/health", response_model=HealthResponse)
@@ -61,24 +62,33 @@ async def health_check():
         "memory_percent": psutil.virtual_memory().percent
     }
 
-    dependencies = {}
-    try:
-        redis = getattr(app.state, "redis", None)
-        if redis:
-            await asyncio.wait_for(redis.ping(), timeout=settings.QUEUE_OP_TIMEOUT)
-            queue_depth = await asyncio.wait_for(redis.llen("arq:queue"), timeout=settings.QUEUE_OP_TIMEOUT)
-            dependencies["redis"] = f"up (queue_depth={queue_depth})"
-        else:
-            dependencies["redis"] = "unavailable"
-    except Exception:
-        dependencies["redis"] = "down"
+    redis = getattr(app.state, "redis", None)
+    timeout = settings.QUEUE_OP_TIMEOUT
+
+    async def _check_redis():
+        await asyncio.wait_for(redis.ping(), timeout=timeout)
+
+    async def _check_queue_depth():
+        return await asyncio.wait_for(redis.llen("arq:queue"), timeout=timeout)
 
-    try:
+    async def _check_db():
         async with async_engine.connect() as conn:
-            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=settings.QUEUE_OP_TIMEOUT)
-        dependencies["database"] = "up"
-    except Exception:
-        dependencies["database"] = "down"
+            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=timeout)
+
+    # Independent round trips: overlap them so /health costs ~1 RTT, not 3
+    probes = [_check_db()]
+    if redis:
+        probes += [_check_redis(), _check_queue_depth()]
+    db, *redis_results = await asyncio.gather(*probes, return_exceptions=True)
+
+    dependencies = {}
+    if not redis:
+        dependencies["redis"] = "unavailable"
+    elif any(isinstance(r, Exception) for r in redis_results):
+        dependencies["redis"] = "down"
+    else:
+        dependencies["redis"] = f"up (queue_depth={redis_results[1]})"
+    dependencies["database"] = "down" if isinstance(db, Exception) else "up"
     
     # API Gateway doesn't manage models or cache - workers do
     
@@ -3,8 +3,10 @@ API Key authentication middleware.
 Enforces X-API-Key or Authorization: Bearer when settings.API_KEY is set.
 """
 
+import hmac
 from typing import Callable
 from fastapi import Request, HTTPException
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from elk.core.config import settings
 
@@ -12,20 +14,38 @@ from elk.core.config import settings
 class APIKeyMiddleware(BaseHTTPMiddleware):
     """Require API key on all endpoints except health/metrics."""
 
+    PUBLIC_PATHS = frozenset({"/health", "/metrics"})
+
+    def __init__(self, app, public_paths=PUBLIC_PATHS):
+        super().__init__(app)
+        self._public_paths = frozenset(public_paths)
+        self._api_key = None
+        self._api_key_b = None
+        self._sync_key()
+
+    def _sync_key(self) -> bytes | None:
+        """Encode settings.API_KEY once; re-encode only if it is replaced."""
+        key = settings.API_KEY
+        if key is not self._api_key:
+            self._api_key = key
+            self._api_key_b = key.encode() if key else None
+        return self._api_key_b
+
     async def dispatch(self, request: Request, call_next: Callable):
-        if not settings.API_KEY:
+        expected = self._sync_key()
+        if expected is None:
             return await call_next(request)
 
-        path = request.url.path
-        if path in {"/health", "/metrics"}:
+        if request.url.path in self._public_paths:
             return await call_next(request)
 
-        provided = request.headers.get("x-api-key") or request.headers.get("authorization")
-        if provided and provided.lower().startswith("bearer "):
-            provided = provided.split(" ", 1)[1]
+        headers = request.headers
+        provided = headers.get("x-api-key") or headers.get("authorization") or ""
+        if provided[:7].lower() == "bearer ":
+            provided = provided[7:]
 
-        if provided != settings.API_KEY:
-            from fastapi.responses import JSONResponse
+        # compare_digest is constant-time, so a mismatch leaks no prefix length
+        if not hmac.compare_digest(provided.encode(), expected):
             return JSONResponse(
                 status_code=401,
                 content={"detail": "Invalid or missing API key"}
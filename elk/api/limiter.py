@@ -5,63 +5,138 @@ Zero-dependency implementation of Token Bucket algorithm for API rate limiting.
 Features:
 - IP-based limiting
 - Token bucket algorithm
-- Clean scaffolding for future Redis integration
+- Optional Redis backend (RATE_LIMIT_BACKEND=redis) shared across API workers
 """
 
 import time
+import asyncio
 import threading
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from elk.core.config import settings
 
 class RateLimiter:
     """
     Token Bucket Rate Limiter.
     Rate: tokens per second
     Capacity: max burst size
+    
+    Buckets are spread over SHARDS independent dict+lock pairs (by IP hash)
+    so concurrent requests from different clients rarely contend.
     """
     
+    SHARDS = 16  # Power of two: shard index is a bit mask
+    
     def __init__(self, rate: float = 2.0, capacity: int = 10):
         self.rate = rate
         self.capacity = capacity
-        # Mapping IP -> (tokens, last_update)
-        self.buckets: Dict[str, Tuple[float, float]] = {}
-        self.lock = threading.Lock()
+        # Per shard: mapping IP -> (tokens, last_update_ns)
+        self._shards: List[Tuple[Dict[str, Tuple[float, int]], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(self.SHARDS)
+        ]
     
     def check_limit(self, ip: str) -> bool:
         """
         Check if request is allowed.
         Returns True if allowed, False if limited.
         """
-        now = time.time()
+        now = time.monotonic_ns()
+        buckets, lock = self._shards[hash(ip) & (self.SHARDS - 1)]
         
-        with self.lock:
-            # Initialize bucket if new
-            if ip not in self.buckets:
-                self.buckets[ip] = (self.capacity, now)
-            
-            tokens, last_update = self.buckets[ip]
+        with lock:
+            tokens, last_update = buckets.get(ip, (self.capacity, now))
             
             # Refill tokens
-            elapsed = now - last_update
-            new_tokens = elapsed * self.rate
-            tokens = min(self.capacity, tokens + new_tokens)
+            tokens = min(self.capacity, tokens + (now - last_update) * self.rate / 1e9)
             
             # Check availability
             if tokens >= 1.0:
-                self.buckets[ip] = (tokens - 1.0, now)
+                buckets[ip] = (tokens - 1.0, now)
                 return True
             else:
-                self.buckets[ip] = (tokens, now)
+                buckets[ip] = (tokens, now)
                 return False
 
+class RedisRateLimiter:
+    """
+    Token Bucket Rate Limiter stored in Redis.
+    
+    One atomic Lua call per request, so every API worker shares the same
+    buckets; idle buckets expire once they would have refilled completely.
+    """
+    
+    KEY_PREFIX = "rl:"
+    
+    # KEYS[1]=bucket, ARGV: now_ms, rate (tokens/s), capacity, ttl_ms
+    LUA_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 't', 'u')
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or capacity
+local last = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate / 1000)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return allowed
+"""
+    
+    def __init__(self, rate: float = 2.0, capacity: int = 10):
+        self.rate = rate
+        self.capacity = capacity
+        self.ttl_ms = int(capacity / rate * 1000) + 1000
+        # Script handle (EVALSHA with automatic reload) for the current client
+        self._script = None
+        self._client = None
+    
+    async def check_limit(self, redis: Any, ip: str) -> bool:
+        """
+        Check if request is allowed.
+        Returns True if allowed, False if limited.
+        """
+        if redis is not self._client:
+            self._script = redis.register_script(self.LUA_SCRIPT)
+            self._client = redis
+        
+        allowed = await self._script(
+            keys=[f"{self.KEY_PREFIX}{ip}"],
+            args=[int(time.time() * 1000), self.rate, self.capacity, self.ttl_ms]
+        )
+        return bool(allowed)
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """FastAPI Middleware for Rate Limiting."""
     
-    def __init__(self, app, limiter: RateLimiter):
+    def __init__(
+        self,
+        app,
+        limiter: RateLimiter,
+        redis_limiter: Optional[RedisRateLimiter] = None
+    ):
         super().__init__(app)
         self.limiter = limiter
+        self.redis_limiter = redis_limiter
+    
+    async def _redis_check(self, request: Request, client_ip: str) -> Optional[bool]:
+        """Check the shared Redis bucket; None if Redis is not usable."""
+        redis = getattr(request.app.state, "redis", None)
+        if self.redis_limiter is None or redis is None:
+            return None
+        try:
+            return await asyncio.wait_for(
+                self.redis_limiter.check_limit(redis, client_ip),
+                timeout=settings.QUEUE_OP_TIMEOUT
+            )
+        except Exception:
+            return None
     
     async def dispatch(self, request: Request, call_next):
         # Skip health checks
@@ -70,7 +145,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             
         client_ip = request.client.host if request.client else "unknown"
         
-        if not self.limiter.check_limit(client_ip):
+        # Fall back to the per-process limiter when Redis is off or unreachable
+        allowed = await self._redis_check(request, client_ip)
+        if allowed is None:
+            allowed = self.limiter.check_limit(client_ip)
+        
+        if not allowed:
             return JSONResponse(
                 status_code=429,
                 content={"detail": "Rate limit exceeded. Please slow down."}
@@ -9,11 +9,16 @@ Implements FastAPI best practices:
 
 import time
 import uuid
+import atexit
+import itertools
+import queue
 import logging
+import threading
 import json
-from datetime import datetime
+from array import array
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable
+from typing import BinaryIO, Callable, Dict, List
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
@@ -25,31 +30,159 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from elk.core.config import settings
 
+# Use orjson for faster JSONL encoding (with fallback)
+try:
+    import orjson
+
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_line(data: dict) -> bytes:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE,
+        )
+except ImportError:
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+
+    def _dumps_line(data: dict) -> bytes:
+        return (json.dumps(data, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+
+# Formatted timestamp shared by every log line within the same millisecond
+_TS_CACHE = ["1970-01-01T00:00:00.000", 0]
+
+
+def _now_iso() -> str:
+    """Current local time in ISO format (ms resolution), formatted at most once per ms."""
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _TS_CACHE[1]:
+        _TS_CACHE[:] = [
+            datetime.fromtimestamp(now_ms / 1000).isoformat(timespec="milliseconds"),
+            now_ms
+        ]
+    return _TS_CACHE[0]
+
 
 class StructuredLogger:
     """
     JSONL logger for production observability.
     Writes to logs/requests.jsonl per MASTER_VISION Part 5.
+    
+    Records are queued and written by a background flusher thread, which
+    issues one write per file per batch (every FLUSH_INTERVAL_S or FLUSH_BYTES)
+    to append-only handles kept open for the process lifetime.
     """
     
+    FLUSH_INTERVAL_S = 0.2
+    FLUSH_BYTES = 1024 * 1024
+    
     def __init__(self, log_dir: str = "logs"):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
-        # Daily rotation
-        today = datetime.now().strftime("%Y-%m-%d")
-        self.request_log = self.log_dir / f"requests_{today}.jsonl"
-        self.error_log = self.log_dir / f"errors_{today}.jsonl"
+        # Unbuffered O_APPEND handles, opened on first write
+        self._files: Dict[Path, BinaryIO] = {}
+        self._files_lock = threading.Lock()
+        
+        # Daily rotation: one float compare per record against next local midnight
+        self._rotate_at = 0.0
+        self._rotate()
+        
+        # Pending (path, line) records, or an Event requesting a flush
+        self._queue: queue.Queue = queue.Queue()
+        self._flusher = threading.Thread(
+            target=self._flusher_loop, name="elk-log-flusher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
         
     def log_request(self, data: dict) -> None:
-        """Log request to JSONL file."""
-        with open(self.request_log, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(data, ensure_ascii=False, default=str) + '\n')
+        """Queue request for the JSONL file."""
+        if time.time() >= self._rotate_at:
+            self._rotate()
+        self._queue.put_nowait((self.request_log, _dumps_line(data)))
     
     def log_error(self, data: dict) -> None:
-        """Log error to separate JSONL file."""
-        with open(self.error_log, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(data, ensure_ascii=False, default=str) + '\n')
+        """Queue error for the separate JSONL file."""
+        if time.time() >= self._rotate_at:
+            self._rotate()
+        self._queue.put_nowait((self.error_log, _dumps_line(data)))
+    
+    def _rotate(self) -> None:
+        """Point at today's files and close handles left over from earlier days."""
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        self.request_log = self.log_dir / f"requests_{today}.jsonl"
+        self.error_log = self.log_dir / f"errors_{today}.jsonl"
+        
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self._rotate_at = midnight.timestamp()
+        
+        current = (self.request_log, self.error_log)
+        with self._files_lock:
+            for path in [p for p in self._files if p not in current]:
+                # Records still queued for the old day reopen it on demand
+                self._files.pop(path).close()
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every record queued so far has been written."""
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        done.wait(timeout)
+    
+    def close(self) -> None:
+        """Flush pending records and close the log handles."""
+        self.flush()
+        with self._files_lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+    
+    def _flusher_loop(self) -> None:
+        """Accumulate queued records and write them one batch at a time."""
+        while True:
+            batch: Dict[Path, List[bytes]] = {}
+            waiters: List[threading.Event] = []
+            size = 0
+            deadline = None
+            
+            while size < self.FLUSH_BYTES:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                path, line = item
+                batch.setdefault(path, []).append(line)
+                size += len(line)
+                if deadline is None:
+                    deadline = time.monotonic() + self.FLUSH_INTERVAL_S
+            
+            self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+    
+    def _write_batch(self, batch: Dict[Path, List[bytes]]) -> None:
+        with self._files_lock:
+            for path, lines in batch.items():
+                try:
+                    f = self._files.get(path)
+                    if f is None:
+                        f = self._files[path] = open(path, 'ab', buffering=0)
+                    f.write(b''.join(lines))
+                except OSError as e:
+                    logging.error(f"StructuredLogger: failed to write {len(lines)} records to {path}: {e}")
+
+
+def flush_logs() -> None:
+    """Flush pending JSONL records (call on shutdown)."""
+    _logger.flush()
 
 
 # Global logger instance
@@ -83,7 +216,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         
         # Log request
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "correlation_id": correlation_id,
             "method": request.method,
             "path": str(request.url.path),
@@ -109,8 +242,14 @@ class MetricsCollector:
     """
     In-memory metrics collector for KPI tracking.
     Aligns with PRD KPIs: 98% validation, Human Override <15%
+    
+    Latency percentiles come from a fixed ring buffer of the most recent
+    LATENCY_WINDOW requests, so recording stays O(1) with no allocation.
     """
     
+    LATENCY_WINDOW = 1024  # Power of two: ring index is a bit mask
+    SNAPSHOT_TTL_S = 1.0
+    
     def __init__(self):
         self._metrics = {
             "total_requests": 0,
@@ -123,18 +262,26 @@ class MetricsCollector:
             "human_reviews_triggered": 0,
             "auto_dispatched": 0
         }
+        self._latencies = array('d', bytes(8 * self.LATENCY_WINDOW))
+        self._latency_seq = itertools.count()
+        # (monotonic time, serialized metrics) served to /metrics scrapes
+        self._snapshot = (float('-inf'), b"")
     
     def record_request(self, success: bool, latency_ms: float):
         """Record request metrics."""
-        self._metrics["total_requests"] += 1
+        m = self._metrics
+        m["total_requests"] += 1
         if success:
-            self._metrics["successful_requests"] += 1
+            m["successful_requests"] += 1
         else:
-            self._metrics["failed_requests"] += 1
+            m["failed_requests"] += 1
         
-        self._metrics["total_latency_ms"] += latency_ms
-        self._metrics["min_latency_ms"] = min(self._metrics["min_latency_ms"], latency_ms)
-        self._metrics["max_latency_ms"] = max(self._metrics["max_latency_ms"], latency_ms)
+        m["total_latency_ms"] += latency_ms
+        if latency_ms < m["min_latency_ms"]:
+            m["min_latency_ms"] = latency_ms
+        if latency_ms > m["max_latency_ms"]:
+            m["max_latency_ms"] = latency_ms
+        self._latencies[next(self._latency_seq) & (self.LATENCY_WINDOW - 1)] = latency_ms
     
     def record_validation_error(self):
         """Record validation error for KPI tracking."""
@@ -156,17 +303,32 @@ class MetricsCollector:
         min_lat = self._metrics["min_latency_ms"]
         if min_lat == float('inf'):
             min_lat = 0.0
+        
+        # Percentiles over the filled part of the ring buffer
+        window = sorted(self._latencies[:min(self._metrics["total_requests"], self.LATENCY_WINDOW)])
+        last = len(window) - 1
             
         return {
             **self._metrics,
             "min_latency_ms": min_lat,
             "avg_latency_ms": round(self._metrics["total_latency_ms"] / total, 2),
+            "p50_latency_ms": round(window[last // 2], 2) if window else 0.0,
+            "p95_latency_ms": round(window[last * 95 // 100], 2) if window else 0.0,
             "success_rate": round(self._metrics["successful_requests"] / total, 4),
             "validation_pass_rate": round(1 - (self._metrics["validation_errors"] / total), 4),
             "human_override_rate": round(
                 self._metrics["human_reviews_triggered"] / max(dispatched, 1), 4
             )
         }
+    
+    def get_metrics_bytes(self) -> bytes:
+        """Serialized get_metrics(), recomputed at most once per SNAPSHOT_TTL_S."""
+        now = time.monotonic()
+        taken_at, payload = self._snapshot
+        if now - taken_at >= self.SNAPSHOT_TTL_S:
+            payload = _dumps(self.get_metrics())
+            self._snapshot = (now, payload)
+        return payload
 
 
 # Global metrics instance
@@ -190,7 +352,7 @@ def create_exception_handlers(app: FastAPI):
             "correlation_id": correlation_id,
             "error_type": "validation_error",
             "detail": exc.errors(),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
         _logger.log_error({
@@ -214,7 +376,7 @@ def create_exception_handlers(app: FastAPI):
             "error_type": "http_error",
             "status_code": exc.status_code,
             "detail": exc.detail,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
         _logger.log_error(error_detail)
@@ -236,7 +398,7 @@ def create_exception_handlers(app: FastAPI):
             "error_type": "server_error",
             "detail": str(exc),
             "trace": traceback.format_exc(),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
         _logger.log_error(error_detail)
@@ -248,7 +410,7 @@ def create_exception_handlers(app: FastAPI):
                 "correlation_id": correlation_id,
                 "error_type": "server_error",
                 "detail": "Internal server error. Check logs with correlation_id.",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         )
 
@@ -260,10 +422,14 @@ def setup_production_middleware(app: FastAPI):
     """
     # Rate Limiting (D2 Optimization)
     try:
-        from .limiter import RateLimitMiddleware, RateLimiter
+        from .limiter import RateLimitMiddleware, RateLimiter, RedisRateLimiter
         # Limit to 5 requests/sec burst 20 (configurable)
         limiter = RateLimiter(rate=5.0, capacity=20)
-        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+        redis_limiter = (
+            RedisRateLimiter(rate=5.0, capacity=20)
+            if settings.RATE_LIMIT_BACKEND == "redis" else None
+        )
+        app.add_middleware(RateLimitMiddleware, limiter=limiter, redis_limiter=redis_limiter)
     except ImportError:
         logging.warning("RateLimiter not available")
 
@@ -296,8 +462,8 @@ def setup_production_middleware(app: FastAPI):
     async def get_metrics():
         """
         Prometheus-style metrics endpoint.
-        Returns current KPIs per PRD Section 4.
+        Returns current KPIs per PRD Section 4 (cached for up to 1s).
         """
-        return metrics.get_metrics()
+        return Response(metrics.get_metrics_bytes(), media_type="application/json")
     
     return app
@@ -4,23 +4,38 @@ Handles Job creation and status retrieval.
 """
 
 import os
-import base64
+import binascii
+import contextlib
 import uuid
 import asyncio
 import time
-from typing import List
+import threading
+from collections import deque
+from typing import Deque, List, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from elk.database.db import get_session
-from elk.database.models import Job, JobStatus
+from elk.database.models import Job, JobStatus, new_job_id
 from elk.api.schemas import TranscribeRequest
 from elk.core.config import settings
 from elk.engine.schemas.interfaces import EmergencyCall
 
+# Use pybase64 (SIMD decoder) for large audio payloads (with fallback)
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 router = APIRouter()
 
+# Uploads in write order as (monotonic expiry ns, path): expiries are monotonic too,
+# so cleanup only ever looks at the head
+_UPLOAD_TTL_QUEUE: Deque[Tuple[int, str]] = deque()
+_UPLOAD_TTL_LOCK = threading.Lock()
+_UPLOAD_TTL_SEEDED = False
+
 @router.post("/jobs", response_model=Job, status_code=201)
 async def create_job(
     request: TranscribeRequest,
@@ -31,22 +46,24 @@ async def create_job(
     """
     Submit a new job for asynchronous processing.
     """
-    job_id = str(uuid.uuid4())
+    job_id = new_job_id()
     correlation_id = getattr(fastapi_req.state, "correlation_id", str(uuid.uuid4())[:8])
 
-    # 1. Safety Check: Verify Audio Size
-    try:
-        audio_data = base64.b64decode(request.audio_base64)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid base64 audio payload")
-    size_mb = len(audio_data) / (1024 * 1024)
+    # 1. Safety Check: Verify Audio Size (from the base64 length, nothing decoded yet)
+    audio_b64 = request.audio_base64
+    size_mb = _b64_decoded_size(audio_b64) / (1024 * 1024)
     if size_mb > settings.MAX_AUDIO_SIZE_MB:
         raise HTTPException(
             status_code=413, 
             detail=f"Audio too large ({size_mb:.1f}MB). Max: {settings.MAX_AUDIO_SIZE_MB}MB"
         )
 
-    if not _is_supported_audio(audio_data):
+    try:
+        audio_header = _b64_decode_header(audio_b64)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid base64 audio payload")
+
+    if not _is_supported_audio(audio_header):
         raise HTTPException(status_code=415, detail="Unsupported audio format")
 
     # 1b. Queue Backpressure
@@ -68,10 +85,15 @@ async def create_job(
     background_tasks.add_task(_cleanup_old_uploads)
 
     try:
-        with open(file_path, "wb") as f:
-            f.write(audio_data)
+        # Blocking decode + disk I/O runs in a worker thread to keep the event loop free
+        await asyncio.to_thread(_write_upload, file_path, audio_b64)
+    except binascii.Error:
+        with contextlib.suppress(OSError):
+            os.remove(file_path)
+        raise HTTPException(status_code=400, detail="Invalid base64 audio payload")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Storage error: {e}")
+    _UPLOAD_TTL_QUEUE.append((time.monotonic_ns() + settings.UPLOAD_TTL_SECONDS * 10**9, file_path))
 
     # 3. Create Job Record
     job = Job(
@@ -81,8 +103,10 @@ async def create_job(
         input_data={"file_path": file_path, "hint": request.language_hint, "correlation_id": correlation_id}
     )
     session.add(job)
+    # Sessions use expire_on_commit=False and the server-side defaults
+    # (created_at/updated_at) are fetched on INSERT via eager_defaults/RETURNING,
+    # so the committed object is already complete: no refresh round trip needed.
     await session.commit()
-    await session.refresh(job)
     
     # 4. Enqueue Task (Using cached Redis pool)
     try:
@@ -132,27 +156,97 @@ async def list_jobs(
     return result.scalars().all()
 
 
+# ID3-tagged or raw MPEG audio frame headers
+_MP3_PREFIXES = (b"ID3", b"\xff\xfb", b"\xff\xf3")
+
+
 def _is_supported_audio(data: bytes) -> bool:
     """Very small header check for WAV/ID3/MP3 frames."""
     if len(data) < 4:
         return False
-    if data.startswith(b"RIFF") and b"WAVE" in data[:16]:
-        return True
-    if data.startswith(b"ID3"):
-        return True
-    if data[0:2] == b"\xff\xfb" or data[0:2] == b"\xff\xf3":
-        return True
-    return False
+    if data.startswith(b"RIFF"):
+        # RIFF form type sits at a fixed offset: no substring scan needed
+        return data[8:12] == b"WAVE"
+    return data.startswith(_MP3_PREFIXES)
 
 
-def _cleanup_old_uploads():
-    """Remove old uploaded files based on TTL to protect disk usage."""
-    cutoff = time.time() - settings.UPLOAD_TTL_SECONDS
+# Base64 characters decoded per write (multiple of 4: decodes to 48 KiB)
+_B64_CHUNK_CHARS = 64 * 1024
+
+# Base64 characters covering the first 18 decoded bytes (enough for header checks)
+_B64_HEADER_CHARS = 24
+
+
+def _b64_decoded_size(audio_b64: str) -> int:
+    """Decoded length of a base64 payload (an upper bound if it holds whitespace)."""
+    return len(audio_b64) * 3 // 4 - audio_b64.endswith("=") - audio_b64.endswith("==")
+
+
+def _b64_decode_header(audio_b64: str) -> bytes:
+    """Decode only the leading bytes of a base64 payload."""
+    try:
+        return base64.b64decode(audio_b64[:_B64_HEADER_CHARS], validate=True)
+    except binascii.Error:
+        # Non-canonical payload (e.g. line breaks): fall back to a lenient decode
+        return base64.b64decode(audio_b64)[:_B64_HEADER_CHARS * 3 // 4]
+
+
+def _write_upload(file_path: str, audio_b64: str) -> None:
+    """
+    Decode a base64 payload straight into the upload file, chunk by chunk,
+    so the full decoded audio is never held in memory.
+    """
+    with open(file_path, "wb") as f:
+        try:
+            for start in range(0, len(audio_b64), _B64_CHUNK_CHARS):
+                chunk = audio_b64[start:start + _B64_CHUNK_CHARS]
+                f.write(base64.b64decode(chunk, validate=True))
+        except binascii.Error:
+            # Non-canonical payload (e.g. line breaks): decode leniently in one go
+            f.seek(0)
+            f.truncate()
+            f.write(base64.b64decode(audio_b64))
+        f.flush()
+        # Read once by the worker later: don't let it evict hotter pages
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _seed_upload_queue():
+    """Queue uploads left over from a previous process (one scandir per process)."""
+    global _UPLOAD_TTL_SEEDED
+    _UPLOAD_TTL_SEEDED = True
     if not os.path.isdir(settings.UPLOAD_DIR):
         return
+    # Map wall-clock mtimes onto the monotonic clock used by the queue
+    offset_ns = time.monotonic_ns() - time.time_ns()
+    ttl_ns = settings.UPLOAD_TTL_SECONDS * 10**9
+    leftovers = []
     for entry in os.scandir(settings.UPLOAD_DIR):
         try:
-            if entry.is_file() and entry.stat().st_mtime < cutoff:
-                os.remove(entry.path)
-        except Exception:
+            if entry.is_file():
+                leftovers.append((entry.stat().st_mtime_ns + offset_ns + ttl_ns, entry.path))
+        except OSError:
             continue
+    leftovers.sort()
+    # Older than anything uploaded since startup, so they belong at the head
+    _UPLOAD_TTL_QUEUE.extendleft(reversed(leftovers))
+
+
+def _cleanup_old_uploads():
+    """Remove old uploaded files based on TTL to protect disk usage."""
+    # Another cleanup already holds the queue head: nothing left for this one
+    if not _UPLOAD_TTL_LOCK.acquire(blocking=False):
+        return
+    try:
+        if not _UPLOAD_TTL_SEEDED:
+            _seed_upload_queue()
+        now = time.monotonic_ns()
+        while _UPLOAD_TTL_QUEUE and _UPLOAD_TTL_QUEUE[0][0] < now:
+            _, path = _UPLOAD_TTL_QUEUE.popleft()
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+    finally:
+        _UPLOAD_TTL_LOCK.release()
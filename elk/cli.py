@@ -9,6 +9,15 @@ import argparse
 from pathlib import Path
 
 
+# (template file, path inside the pack) rendered by scaffold()
+SCAFFOLD_TEMPLATES = (
+    ("config.yaml.tmpl", "config.yaml"),
+    ("lexicon.py.tmpl", "data/lexicon.py"),
+    ("pipeline.py.tmpl", "runtime/pipeline.py"),
+    ("extraction.md.tmpl", "prompts/extraction.md"),
+)
+
+
 def scaffold(args):
     """
     Create a new language pack with standard structure.
@@ -31,144 +40,53 @@ def scaffold(args):
         base_dir / "models",
     ]
     
+    # Progress report, written to stdout in one go once everything exists
+    report = []
+    
     for d in dirs:
         d.mkdir(parents=True, exist_ok=True)
-        print(f"📁 Created: {d}")
-    
-    # Create config.yaml
-    config_content = f'''# {args.name} Pack Configuration
-pack:
-  name: "{args.name}"
-  version: "0.1.0"
-  language: "{args.language or 'und'}"
-  domain: "{args.domain or 'general'}"
-
-llm:
-  provider: "${{LLM_PROVIDER:-gemini}}"
-  cloud:
-    model: "gemini-1.5-flash"
-    api_key: "${{GEMINI_API_KEY}}"
-  local:
-    model: "${{OLLAMA_MODEL:-llama3}}"
-    base_url: "${{OLLAMA_BASE_URL:-http://localhost:11434}}"
-
-asr:
-  model: "${{WHISPER_MODEL:-small}}"
-  enable_alignment: true
-
-rag:
-  enable_vector: true
-  keyword_weight: 0.5
-  vector_weight: 0.5
-
-confidence:
-  asr_weight: 0.40
-  entity_weight: 0.35
-  rag_weight: 0.25
-  human_review_threshold: 0.70
-'''
-    (base_dir / "config.yaml").write_text(config_content, encoding='utf-8')
-    print(f"📝 Created: {base_dir / 'config.yaml'}")
-    
-    # Create __init__.py files
-    (base_dir / "__init__.py").write_text(f'# {args.name} Pack\\n', encoding='utf-8')
-    (base_dir / "data" / "__init__.py").write_text('# Data module\\n', encoding='utf-8')
-    (base_dir / "runtime" / "__init__.py").write_text('# Runtime module\\n', encoding='utf-8')
-    (base_dir / "prompts" / "__init__.py").write_text('# Prompts module\\n', encoding='utf-8')
-    
-    # Create skeleton lexicon.py
-    lexicon_content = f'''"""
-{args.name} - Lexicon
-Vocabulary mappings and location data.
-"""
-
-# Vocabulary: Local Language -> Standard
-VOCAB_MAP = {{
-    # Add your mappings here
-    # "local_word": "standard_word",
-}}
-
-# Communes/Regions
-COMMUNES = [
-    # Add your communes here
-]
-
-# Landmarks/Quartiers
-QUARTIERS = [
-    # Add your landmarks here
-]
-'''
-    (base_dir / "data" / "lexicon.py").write_text(lexicon_content, encoding='utf-8')
-    print(f"📝 Created: {base_dir / 'data' / 'lexicon.py'}")
-    
-    # Create skeleton pipeline.py
-    pipeline_content = f'''"""
-{args.name} - Pipeline Implementation
-"""
-
-from typing import Dict, Any
-from elk.kernel.pipeline.base_pipeline import BasePipeline
-from elk.kernel.ai.llm import LLMClient
-from elk.kernel.scoring import ConfidenceCalculator
-from elk.kernel.rag import HybridRAG
-from .data.lexicon import VOCAB_MAP, COMMUNES, QUARTIERS
-
-
-class Pipeline(BasePipeline):
-    """
-    Language pack pipeline for {args.name}.
-    Implement the abstract methods.
-    """
+        report.append(f"📁 Created: {d}")
     
-    def __init__(self, config: Dict[str, Any]):
-        super().__init__(config)
-        self.llm = LLMClient()
-        # TODO: Initialize ASR, RAG, etc.
+    # Collected {path: content} and written in one pass at the end
+    files: dict[Path, str] = {}
     
-    def transcribe(self, audio_path: str) -> str:
-        """Implement ASR transcription."""
-        raise NotImplementedError("Implement transcribe()")
+    # Render pack files from elk/factory/templates (string.Template, $-placeholders)
+    from string import Template
+    from importlib.resources import files as resource_files
     
-    def normalize(self, raw_text: str) -> str:
-        """Implement text normalization."""
-        return raw_text.lower().strip()
-    
-    def extract(self, normalized_text: str) -> Dict[str, Any]:
-        """Implement entity extraction."""
-        raise NotImplementedError("Implement extract()")
-'''
-    (base_dir / "runtime" / "pipeline.py").write_text(pipeline_content, encoding='utf-8')
-    print(f"📝 Created: {base_dir / 'runtime' / 'pipeline.py'}")
+    templates = resource_files("elk.factory") / "templates"
+    values = {
+        "name": args.name,
+        "language": args.language or "und",
+        "language_label": args.language or "undefined",
+        "domain": args.domain or "general",
+    }
+    for template_name, target in SCAFFOLD_TEMPLATES:
+        text = (templates / template_name).read_text(encoding="utf-8")
+        files[base_dir / target] = Template(text).substitute(values)
     
-    # Create extraction prompt
-    prompt_content = f'''# {args.name} - Extraction Prompt
-
-You are an AI assistant for extracting structured data from transcribed calls.
-
-## Context
-Domain: {args.domain or 'general'}
-Language: {args.language or 'undefined'}
-
-## Output Schema
-Return valid JSON matching the EmergencyCall schema:
-- incident_type: Type of incident
-- urgency: LOW, MEDIUM, HIGH, CRITICAL
-- location: {{ commune, details, coordinates }}
-- description: Brief summary
-
-## Rules
-1. Use ONLY information from the transcript
-2. When uncertain, set needs_human_review to true
-3. Preserve original language for quoted speech
-'''
-    (base_dir / "prompts" / "extraction.md").write_text(prompt_content, encoding='utf-8')
-    print(f"📝 Created: {base_dir / 'prompts' / 'extraction.md'}")
-    
-    print(f"\n✅ Pack scaffolded: {base_dir}")
-    print(f"   Next steps:")
-    print(f"   1. Edit data/lexicon.py with your vocabulary")
-    print(f"   2. Implement runtime/pipeline.py")
-    print(f"   3. Customize prompts/extraction.md")
+    # Create __init__.py files
+    files[base_dir / "__init__.py"] = f"# {args.name} Pack\n"
+    for module in ("data", "runtime", "prompts"):
+        files[base_dir / module / "__init__.py"] = f"# {module.capitalize()} module\n"
+    
+    # Independent small files: overlap their open/write/close round trips
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda item: item[0].write_bytes(item[1]),
+                      ((path, content.encode('utf-8')) for path, content in files.items())))
+    for path in files:
+        if path.name != "__init__.py":
+            report.append(f"📝 Created: {path}")
+    
+    report += [
+        f"\n✅ Pack scaffolded: {base_dir}",
+        "   Next steps:",
+        "   1. Edit data/lexicon.py with your vocabulary",
+        "   2. Implement runtime/pipeline.py",
+        "   3. Customize prompts/extraction.md",
+    ]
+    sys.stdout.write("\n".join(report) + "\n")
     
     return 0
 
@@ -315,7 +233,6 @@ def package(args):
         print(f"❌ Pack not found: {pack_dir}")
         return 1
     
-    import shutil
     import json
     from datetime import datetime
     
@@ -328,20 +245,20 @@ def package(args):
         "files": []
     }
     
-    for f in pack_dir.rglob("*"):
-        if f.is_file() and "__pycache__" not in str(f):
-            manifest["files"].append(str(f.relative_to(pack_dir)))
+    root = str(pack_dir)
+    manifest["files"] = [os.path.relpath(path, root) for path in _walk_files(root)]
     
     manifest_file = pack_dir / "MANIFEST.json"
-    manifest_file.write_text(json.dumps(manifest, indent=2))
+    try:
+        import orjson
+        manifest_file.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    except ImportError:
+        manifest_file.write_text(json.dumps(manifest, indent=2))
     
     # Create tarball
-    shutil.make_archive(
-        output.replace(".tar.gz", ""),
-        "gztar",
-        "packs",
-        pack_name
-    )
+    if not output.endswith(".tar.gz"):
+        output += ".tar.gz"
+    _write_tarball(output, pack_dir, pack_name)
     
     print(f"📦 Packaged: {output}")
     print(f"   Files: {len(manifest['files'])}")
@@ -349,6 +266,47 @@ def package(args):
     return 0
 
 
+def _write_tarball(output: str, pack_dir: Path, arcname: str) -> None:
+    """
+    Stream pack_dir into a .tar.gz at gzip level 6 (level 9 costs ~2x CPU for
+    a few % on model weights). Uses pigz on all cores when it is installed.
+    """
+    import shutil
+    import tarfile
+    import subprocess
+    
+    def skip_pycache(info: tarfile.TarInfo):
+        return None if "__pycache__" in info.name.split("/") else info
+    
+    pigz = shutil.which("pigz")
+    if not pigz:
+        with tarfile.open(output, "w:gz", compresslevel=6) as tar:
+            tar.add(pack_dir, arcname=arcname, filter=skip_pycache)
+        return
+    
+    with open(output, "wb") as out:
+        proc = subprocess.Popen([pigz, "-6"], stdin=subprocess.PIPE, stdout=out)
+        try:
+            with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                tar.add(pack_dir, arcname=arcname, filter=skip_pycache)
+        finally:
+            proc.stdin.close()
+            if proc.wait() != 0:
+                raise RuntimeError(f"pigz exited with status {proc.returncode}")
+
+
+def _walk_files(root: str):
+    """Yield file paths under root, skipping __pycache__ (file types come from readdir, no stat)."""
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.name == "__pycache__":
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file():
+                yield entry.path
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="elk",
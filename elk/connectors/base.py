@@ -12,11 +12,17 @@ class BaseConnector(ABC):
     Implementations: MockERP, Webhook, Salesforce, etc.
     """
     
+    # True when push_incident() already retries and bounds its own attempts;
+    # the worker then calls it once, without its own retry loop or timeout
+    retries_internally: bool = False
+    
     @abstractmethod
     async def push_incident(self, incident_data: Dict[str, Any]) -> bool:
         """
         Push incident data to the external system.
-        Returns True if successful, False otherwise.
+        Returns True if successful, False for a permanent failure (e.g. missing
+        configuration) that the worker will not retry. Raise for transient
+        errors the worker should retry.
         """
         pass
     
@@ -24,3 +30,8 @@ class BaseConnector(ABC):
     async def health_check(self) -> bool:
         """Check connection to external system."""
         pass
+    
+    async def close(self) -> None:
+        """Release connector resources (called on shutdown)."""
+        # No-op by default: connectors without open clients have nothing to release
+        return None
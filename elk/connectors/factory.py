@@ -3,21 +3,42 @@ Connector Factory
 Instantiates the appropriate connector based on configuration.
 """
 
-import os
+from typing import ClassVar, Optional
 from elk.connectors.base import BaseConnector
 from elk.connectors.mock_erp import MockERPConnector
 from elk.connectors.webhook import WebhookConnector
+from elk.core.config import settings
+
+
+def _make_connector(conn_type: str) -> BaseConnector:
+    if conn_type == "webhook":
+        return WebhookConnector()
+    elif conn_type == "salesforce":
+        # Future implementation
+        raise NotImplementedError("Salesforce connector not implemented")
+    else:
+        return MockERPConnector()
+
 
 class ConnectorFactory:
-    @staticmethod
-    def get_connector() -> BaseConnector:
-        """Return configured connector instance."""
-        conn_type = os.getenv("CONNECTOR_TYPE", "mock").lower()
-        
-        if conn_type == "webhook":
-            return WebhookConnector()
-        elif conn_type == "salesforce":
-            # Future implementation
-            raise NotImplementedError("Salesforce connector not implemented")
-        else:
-            return MockERPConnector()
+    # Process-wide connector: holds config and shared handles only
+    _instance: ClassVar[Optional[BaseConnector]] = None
+
+    @classmethod
+    def get_connector(cls) -> BaseConnector:
+        """Return configured connector instance (built once, then shared)."""
+        if cls._instance is None:
+            cls._instance = _make_connector(settings.CONNECTOR_TYPE.lower())
+        return cls._instance
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the shared connector so the next call picks up new settings."""
+        cls._instance = None
+
+    @classmethod
+    async def close(cls) -> None:
+        """Flush and close the shared connector (call on shutdown)."""
+        if cls._instance is not None:
+            await cls._instance.close()
+            cls._instance = None
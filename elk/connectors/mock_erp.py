@@ -6,36 +6,113 @@ Useful for demos and testing without external dependencies.
 
 import json
 import os
+import asyncio
+import contextlib
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import BinaryIO, Dict, Any, Optional
 from elk.connectors.base import BaseConnector
 
+# Use orjson for faster event serialization (with fallback)
+# (both emit datetimes in isoformat(); orjson formats them natively in C)
+try:
+    import orjson
+
+    def _dumps_line(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _isoformat(obj: Any) -> str:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _dumps_line(data: Dict[str, Any]) -> bytes:
+        return (json.dumps(data, default=_isoformat) + "\n").encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
 class MockERPConnector(BaseConnector):
+    # Max events folded into a single write() by the background writer
+    BATCH_SIZE = 256
+    
     def __init__(self, log_file: str = "mock_erp_events.jsonl"):
         self.log_file = log_file
+        # Long-lived unbuffered O_APPEND handle: one write() syscall per batch
+        self._file: Optional[BinaryIO] = None
+        # (line, future) pairs drained by the writer task, both created on first push
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
         
     async def push_incident(self, incident_data: Dict[str, Any]) -> bool:
         """Simulate creating a ticket in the ERP."""
         payload = {
-            "erp_timestamp": datetime.utcnow().isoformat(),
+            "erp_timestamp": datetime.utcnow(),
             "event": "INCIDENT_REPORT",
             "source": "ELK_AI_AGENT",
             "data": incident_data
         }
         
         try:
-            # Atomic append (os agnostic enough for demo)
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(payload) + "\n")
-            
-            logger.info(f"MockERP: Incident pushed to {self.log_file}")
-            return True
+            line = _dumps_line(payload)
         except Exception as e:
             logger.error(f"MockERP Push Failed: {e}")
             return False
+        
+        if self._writer is None or self._writer.done():
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._drain())
+        
+        # Group commit: resolves once the batch holding this line is on disk
+        written = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((line, written))
+        if not await written:
+            return False
+        
+        logger.info(f"MockERP: Incident pushed to {self.log_file}")
+        return True
+
+    async def _drain(self) -> None:
+        """Write queued events in batches until cancelled."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                # Disk I/O runs in a worker thread; single writer keeps JSONL lines whole
+                await asyncio.to_thread(self._append, b"".join(line for line, _ in batch))
+                ok = True
+            except Exception as e:
+                logger.error(f"MockERP Push Failed ({len(batch)} events): {e}")
+                ok = False
+            
+            for _, written in batch:
+                if not written.done():
+                    written.set_result(ok)
+                queue.task_done()
+
+    def _append(self, data: bytes) -> None:
+        if self._file is None:
+            self._file = open(self.log_file, "ab", buffering=0)
+        self._file.write(data)
+
+    async def flush(self) -> None:
+        """Wait until every queued event has been written."""
+        if self._writer is not None and not self._writer.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush pending events, stop the writer and close the event log handle."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
     async def health_check(self) -> bool:
         return True
@@ -4,36 +4,112 @@ Pushes incidents to a configured HTTP endpoint (e.g., Zapier, n8n, Custom API).
 """
 
 import os
+import uuid
+import asyncio
 import httpx
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from elk.connectors.base import BaseConnector
+from elk.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 class WebhookConnector(BaseConnector):
+    # _post_hedged() is the only retry layer for webhook pushes
+    retries_internally = True
+    
+    # Shared across instances (the factory builds one per job) so pushes reuse
+    # pooled keep-alive connections instead of paying DNS + TLS every time
+    _client: Optional[httpx.AsyncClient] = None
+    
     def __init__(self, webhook_url: str = None):
         self.webhook_url = webhook_url or os.getenv("WEBHOOK_URL")
+    
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                timeout=settings.CONNECTOR_TIMEOUT,
+                limits=httpx.Limits(max_keepalive_connections=32),
+                headers={"User-Agent": "ELK-AI-Agent/0.2.0"}
+            )
+        return cls._client
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared HTTP client (call on shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
         
     async def push_incident(self, incident_data: Dict[str, Any]) -> bool:
         if not self.webhook_url:
             logger.warning("WebhookConnector: No URL configured.")
             return False
-            
+        
+        # One key for every hedged attempt, so the receiver can drop duplicates
+        idempotency_key = str(incident_data.get("job_id") or uuid.uuid4())
+        pushed = await self._post_hedged(incident_data, idempotency_key)
+        if pushed:
+            logger.info(f"Webhook pushed to {self.webhook_url} (Region: {incident_data.get('region', 'unknown')})")
+        return pushed
+
+    async def _post_once(self, incident_data: Dict[str, Any], idempotency_key: str) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=incident_data,
-                    headers={"User-Agent": "ELK-AI-Agent/0.2.0"}
-                )
-                response.raise_for_status()
-                logger.info(f"Webhook pushed to {self.webhook_url} (Region: {incident_data.get('region', 'unknown')})")
-                return True
+            response = await self._get_client().post(
+                self.webhook_url,
+                json=incident_data,
+                headers={"Idempotency-Key": idempotency_key}
+            )
+            response.raise_for_status()
+            return True
         except Exception as e:
             logger.error(f"Webhook Push Failed: {e}")
             return False
 
+    async def _post_hedged(self, incident_data: Dict[str, Any], idempotency_key: str) -> bool:
+        """
+        Up to CONNECTOR_MAX_RETRIES attempts, the next one starting after an
+        exponential backoff even if earlier attempts are still in flight; the
+        first success wins and cancels the rest. A slow target therefore costs
+        one backoff step, not a full timeout per attempt. Each attempt is bounded
+        by the client's CONNECTOR_TIMEOUT, so at most CONNECTOR_MAX_RETRIES POSTs
+        are sent per push (the worker does not retry on top of this).
+        
+        A slow receiver can get the same incident more than once: every attempt
+        carries the same Idempotency-Key header (the job_id) to deduplicate on.
+        """
+        loop = asyncio.get_running_loop()
+        attempts = max(settings.CONNECTOR_MAX_RETRIES, 1)
+        pending = set()
+        try:
+            for attempt in range(attempts):
+                pending.add(asyncio.create_task(self._post_once(incident_data, idempotency_key)))
+                if attempt == attempts - 1:
+                    break
+                hedge_at = loop.time() + settings.CONNECTOR_RETRY_BASE_DELAY * (2 ** attempt)
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, timeout=max(hedge_at - loop.time(), 0.0),
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if any(task.result() for task in done):
+                        return True
+                    if not done:
+                        break  # still in flight at the deadline: hedge
+                else:
+                    # Every attempt so far failed fast: back off before the next
+                    await asyncio.sleep(max(hedge_at - loop.time(), 0.0))
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(task.result() for task in done):
+                    return True
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def health_check(self) -> bool:
         if not self.webhook_url:
             return False
@@ -30,6 +30,7 @@ class Settings(BaseSettings):
 
     # API Security
     API_KEY: str | None = os.getenv("API_KEY")
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory") # or "redis"
     ALLOWED_ORIGINS: list[str] = os.getenv(
         "ALLOWED_ORIGINS",
         "http://localhost,http://127.0.0.1"
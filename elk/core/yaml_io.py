@@ -0,0 +1,27 @@
+"""
+ELK Core - YAML I/O
+Single entry point for parsing and writing YAML, using libyaml's C loader
+and dumper when available.
+"""
+
+from pathlib import Path
+from typing import IO, Any, Union
+
+import yaml
+
+# C-accelerated loader/dumper (~10x faster), pure-Python fallback when libyaml is missing
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
+def load(path: Union[str, Path]) -> Any:
+    """Parse a YAML file."""
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def dump(data: Any, stream: IO[str]) -> None:
+    """Write `data` as human-readable block-style YAML (unicode kept as-is)."""
+    yaml.dump(data, stream, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False)
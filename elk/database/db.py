@@ -6,6 +6,8 @@ Defaults to SQLite for development, configured for Postgres in production.
 
 import os
 from sqlmodel import create_engine, SQLModel
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -13,21 +15,84 @@ from sqlalchemy.orm import sessionmaker
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///elk_jobs.db")
 SYNC_DATABASE_URL = os.getenv("SYNC_DATABASE_URL", "sqlite:///elk_jobs.db")
 
+# Use orjson for JSON columns (with fallback to SQLAlchemy's stdlib default)
+try:
+    import orjson
+
+    def _json_serializer(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    JSON_ENGINE_ARGS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+except ImportError:
+    JSON_ENGINE_ARGS = {}
+
+# SQLite tuning for many small Job inserts/updates from API + workers:
+# WAL lets readers run alongside the writer, NORMAL fsyncs only at checkpoints
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",    # 64 MB
+)
+
+
+def _connect_args(url: str) -> dict:
+    # Wait up to 30s on a locked database instead of failing fast
+    return {"check_same_thread": False, "timeout": 30} if url.startswith("sqlite") else {}
+
+
+def _apply_sqlite_pragmas(sync_engine: Engine) -> None:
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 # Async Engine (for API/Workers)
-async_engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+async_engine = create_async_engine(
+    DATABASE_URL, echo=False, future=True, connect_args=_connect_args(DATABASE_URL),
+    **JSON_ENGINE_ARGS
+)
+_apply_sqlite_pragmas(async_engine.sync_engine)
 
 # Sync Engine (for migrations/scripts)
-engine = create_engine(SYNC_DATABASE_URL, echo=False)
+engine = create_engine(
+    SYNC_DATABASE_URL, echo=False, connect_args=_connect_args(SYNC_DATABASE_URL),
+    **JSON_ENGINE_ARGS
+)
+_apply_sqlite_pragmas(engine)
+
+# Single-column indexes replaced by the composites declared on Job
+LEGACY_INDEXES = ("ix_job_status", "ix_job_pack_name")
+
+
+def _sync_indexes(conn) -> None:
+    """Bring indexes of pre-existing tables in line (create_all skips existing tables)."""
+    for name in LEGACY_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
 
 async def init_db():
     """Initialize database tables."""
     async with async_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_sync_indexes)
+
+# Built once: sessions are cheap, the factory and its bind bookkeeping are not
+AsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 async def get_session() -> AsyncSession:
     """Dependency for FastAPI sessions."""
-    async_session = sessionmaker(
-        async_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
+    async with AsyncSessionLocal() as session:
         yield session
@@ -6,9 +6,65 @@ Defines the schema for the Job Orchestration system.
 from enum import Enum
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlmodel import SQLModel, Field, Column, JSON
+from sqlmodel import SQLModel, Field, Column, JSON, Index
+from sqlalchemy import DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+import os
+import time
 import uuid
 
+
+def _uuid7() -> uuid.UUID:
+    """RFC 9562 UUIDv7: 48-bit Unix ms timestamp, then 74 random bits."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+# stdlib has uuid7 from Python 3.14
+uuid7 = getattr(uuid, "uuid7", _uuid7)
+
+
+def new_job_id() -> str:
+    """
+    Time-ordered job id: inserts append to the primary key B-tree instead of
+    landing on random pages. Same 36-char form as the uuid4 ids already stored.
+    """
+    return str(uuid7())
+
+JSON_PAYLOAD = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """Naive UTC 'now' computed by the database (matches datetime.utcnow())."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has second precision on SQLite
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def _timestamp_column(**kwargs) -> Column:
+    # default= renders the SQL inline in INSERT (works on tables created before the
+    # server default existed); server_default covers inserts from outside the ORM
+    return Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False, **kwargs)
+
 class JobStatus(str, Enum):
     QUEUED = "queued"
     PROCESSING = "processing"
@@ -21,16 +77,24 @@ class Job(SQLModel, table=True):
     Represents an asynchronous processing job.
     Tracks state, inputs, results, and timing.
     """
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    status: JobStatus = Field(default=JobStatus.QUEUED, index=True)
+    # Composite indexes serve the worker/queue scans (status bucket in created_at
+    # order) and per-pack filters; their prefixes cover status- or pack-only lookups
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_job_status_created", "status", "created_at"),
+        Index("ix_job_pack_status", "pack_name", "status"),
+    )
+    
+    id: str = Field(default_factory=new_job_id, primary_key=True)
+    status: JobStatus = Field(default=JobStatus.QUEUED)
     
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Timestamps (filled by the database, fetched back via RETURNING)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(onupdate=utcnow()))
     
-    # Data Payload (JSON stored as dict)
-    input_data: Dict[str, Any] = Field(sa_column=Column(JSON))
-    result_data: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    # Data Payload (JSON stored as dict; binary JSONB on Postgres)
+    input_data: Dict[str, Any] = Field(sa_column=Column(JSON_PAYLOAD))
+    result_data: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON_PAYLOAD))
     
     # Error Handling
     error_message: Optional[str] = None
@@ -38,4 +102,4 @@ class Job(SQLModel, table=True):
     
     # Metrics
     processing_time: Optional[float] = None
-    pack_name: str = Field(index=True)
+    pack_name: str
@@ -0,0 +1,265 @@
+"""
+ELK Kernel - Async LLM Client
+Concurrent cloud/local LLM dispatch with bounded concurrency, RPM/TPM
+rate limiting and non-blocking exponential backoff.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+from .llm import RetryConfig, LLMClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute / 60` tokens per second.
+    Shared by every coroutine of a client, so bursts are capped at `per_minute`.
+    """
+    
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available, then take them."""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class BaseAsyncLLMClient(ABC):
+    """Abstract base class for async LLM clients."""
+    
+    def __init__(
+        self,
+        retry_config: Optional[RetryConfig] = None,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        self.retry_config = retry_config or RetryConfig()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rpm = AsyncTokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tpm = AsyncTokenBucket(tokens_per_minute) if tokens_per_minute else None
+    
+    @abstractmethod
+    async def _call_api(self, prompt: str, system_prompt: str) -> str:
+        """Make the actual API call. Implement in subclass."""
+        pass
+    
+    async def aclose(self) -> None:
+        """Release network resources."""
+        # No-op by default: only clients holding a connection pool override this
+        return None
+    
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """
+        Generate response with retry logic.
+        Backoff sleeps yield to the event loop instead of blocking it.
+        """
+        last_exception = None
+        
+        for attempt in range(self.retry_config.max_retries + 1):
+            try:
+                if self._rpm:
+                    await self._rpm.acquire()
+                if self._tpm:
+                    # ~4 characters per token is close enough for budgeting
+                    await self._tpm.acquire((len(prompt) + len(system_prompt)) / 4)
+                async with self._semaphore:
+                    return await self._call_api(prompt, system_prompt)
+            
+            except Exception as e:
+                last_exception = e
+                
+                if attempt < self.retry_config.max_retries:
+                    delay = min(
+                        self.retry_config.base_delay_seconds * (
+                            self.retry_config.exponential_base ** attempt
+                        ),
+                        self.retry_config.max_delay_seconds
+                    )
+                    
+                    # Lazy %-formatting: nothing is rendered when WARNING is filtered out
+                    logger.warning(
+                        "LLM call failed (attempt %d/%d): %s. Retrying in %.1fs...",
+                        attempt + 1, self.retry_config.max_retries + 1, e, delay
+                    )
+                    await asyncio.sleep(delay)
+        
+        logger.error("LLM call failed after %d attempts", self.retry_config.max_retries + 1)
+        raise last_exception
+
+
+class AsyncGeminiClient(BaseAsyncLLMClient):
+    """Google Gemini client using the SDK's async entry point."""
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-1.5-flash",
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self._api_key = api_key
+        self.model = model
+        self._client = None
+    
+    def _get_client(self):
+        """Lazy initialization of Gemini client."""
+        if self._client is None:
+            import google.generativeai as genai
+            key = self._api_key or os.getenv("GEMINI_API_KEY")
+            if not key:
+                raise ValueError(
+                    "GEMINI_API_KEY required. Set env variable or pass api_key parameter."
+                )
+            genai.configure(api_key=key)
+            self._client = genai.GenerativeModel(self.model)
+        return self._client
+    
+    async def _call_api(self, prompt: str, system_prompt: str) -> str:
+        """Make Gemini API call."""
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        response = await self._get_client().generate_content_async(full_prompt)
+        return response.text
+
+
+class AsyncOllamaClient(BaseAsyncLLMClient):
+    """Ollama client on a pooled httpx.AsyncClient (local/air-gapped)."""
+    
+    def __init__(
+        self,
+        model: str = "llama3",
+        base_url: str = "http://localhost:11434",
+        timeout_seconds: int = 60,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout_seconds
+        self._http = None
+    
+    async def _call_api(self, prompt: str, system_prompt: str) -> str:
+        """Make Ollama API call with connection reuse."""
+        if self._http is None:
+            import httpx
+            self._http = httpx.AsyncClient(timeout=self.timeout)
+        
+        response = await self._http.post(
+            f"{self.base_url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "system": system_prompt,
+                "stream": False
+            }
+        )
+        response.raise_for_status()
+        return response.json().get("response", "")
+    
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+class AsyncLLMClient:
+    """
+    Unified async LLM client with Cloud/Local toggle.
+    
+    Usage:
+        client = AsyncLLMClient(max_concurrency=16, requests_per_minute=300)
+        answers = await client.generate_many(prompts)
+        
+        # Legacy (sync) callers
+        text = client.generate_sync("Extract entities from: ...")
+    """
+    
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        retry_config: Optional[RetryConfig] = None,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        self.provider = provider or os.getenv("LLM_PROVIDER", "gemini")
+        
+        options = {
+            "retry_config": retry_config or RetryConfig(
+                max_retries=3,
+                base_delay_seconds=1.0,
+                max_delay_seconds=30.0
+            ),
+            "max_concurrency": max_concurrency,
+            "requests_per_minute": requests_per_minute,
+            "tokens_per_minute": tokens_per_minute
+        }
+        
+        if self.provider == "gemini":
+            self._client = AsyncGeminiClient(**options)
+        elif self.provider == "ollama":
+            self._client = AsyncOllamaClient(
+                model=os.getenv("OLLAMA_MODEL", "llama3"),
+                base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+                **options
+            )
+        else:
+            raise ValueError(f"Unknown LLM provider: {self.provider}")
+        
+        logger.info("Async LLM Client initialized: provider=%s", self.provider)
+    
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """Generate response using configured provider."""
+        return await self._client.generate(prompt, system_prompt)
+    
+    async def extract_json(self, prompt: str, system_prompt: str = "") -> Dict[str, Any]:
+        """Generate and parse JSON response."""
+        response = await self.generate(prompt, system_prompt)
+        return LLMClient._parse_json_response(response)
+    
+    async def generate_many(
+        self,
+        prompts: List[str],
+        system_prompt: str = "",
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Run independent prompts concurrently (bounded by max_concurrency and rate limits)."""
+        return await asyncio.gather(
+            *(self.generate(p, system_prompt) for p in prompts),
+            return_exceptions=return_exceptions
+        )
+    
+    def generate_sync(self, prompt: str, system_prompt: str = "") -> str:
+        """Blocking wrapper for callers without an event loop."""
+        return asyncio.run(self._generate_and_close(prompt, system_prompt))
+    
+    async def _generate_and_close(self, prompt: str, system_prompt: str) -> str:
+        # Pooled connections are bound to the loop asyncio.run() is about to close
+        try:
+            return await self.generate(prompt, system_prompt)
+        finally:
+            await self._client.aclose()
+    
+    async def aclose(self) -> None:
+        """Release network resources."""
+        await self._client.aclose()
@@ -4,10 +4,16 @@ Implements robust cloud/local toggle with exponential backoff.
 """
 
 import os
+import re
+import json
 import time
+import hashlib
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 # Use orjson for 3-10x faster JSON parsing (with fallback)
@@ -16,13 +22,18 @@ try:
     def json_loads(s): return orjson.loads(s)
     def json_dumps(obj): return orjson.dumps(obj).decode()
 except ImportError:
-    import json
     json_loads = json.loads
     json_dumps = json.dumps
 
 
 logger = logging.getLogger(__name__)
 
+# Leading ```/```json and trailing ``` of a markdown-fenced answer
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?|```\s*\Z")
+# Candidate starts of a JSON value embedded in prose
+_JSON_START_RE = re.compile(r"[\[{]")
+_RAW_DECODER = json.JSONDecoder()
+
 
 @dataclass
 class RetryConfig:
@@ -33,6 +44,58 @@ class RetryConfig:
     exponential_base: float = 2.0
 
 
+class ResponseCache:
+    """
+    Thread-safe LRU of LLM responses keyed by a digest of (system, prompt).
+    Only the 16-byte digests are held as keys, not the prompts themselves.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(prompt: str, system_prompt: str) -> bytes:
+        h = hashlib.blake2b(system_prompt.encode(), digest_size=16)
+        h.update(b"\0")
+        h.update(prompt.encode())
+        return h.digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def put(self, key: bytes, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+@lru_cache(maxsize=32)
+def _type_adapter(schema: Any):
+    """One pydantic v2 TypeAdapter per schema, so its core validator is built once."""
+    from pydantic import TypeAdapter
+    return TypeAdapter(schema)
+
+
+@lru_cache(maxsize=64)
+def _json_only_system_prompt(system_prompt: str) -> str:
+    return f"""{system_prompt}
+
+IMPORTANT: Respond with valid JSON only. No markdown, no explanation.
+"""
+
+
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients."""
     
@@ -44,6 +107,11 @@ class BaseLLMClient(ABC):
         """Make the actual API call. Implement in subclass."""
         pass
     
+    def close(self) -> None:
+        """Release network resources."""
+        # No-op by default: only clients holding a connection pool override this
+        return None
+    
     def generate(self, prompt: str, system_prompt: str = "") -> str:
         """
         Generate response with retry logic.
@@ -67,14 +135,15 @@ class BaseLLMClient(ABC):
                         self.retry_config.max_delay_seconds
                     )
                     
+                    # Lazy %-formatting: nothing is rendered when WARNING is filtered out
                     logger.warning(
-                        f"LLM call failed (attempt {attempt + 1}/{self.retry_config.max_retries + 1}): {e}. "
-                        f"Retrying in {delay:.1f}s..."
+                        "LLM call failed (attempt %d/%d): %s. Retrying in %.1fs...",
+                        attempt + 1, self.retry_config.max_retries + 1, e, delay
                     )
                     time.sleep(delay)
         
         # All retries exhausted
-        logger.error(f"LLM call failed after {self.retry_config.max_retries + 1} attempts")
+        logger.error("LLM call failed after %d attempts", self.retry_config.max_retries + 1)
         raise last_exception
 
 
@@ -137,7 +206,8 @@ class OllamaClient(BaseLLMClient):
         model: str = "llama3",
         base_url: str = "http://localhost:11434",
         timeout_seconds: int = 60,
-        retry_config: Optional[RetryConfig] = None
+        retry_config: Optional[RetryConfig] = None,
+        pool_size: int = 64
     ):
         super().__init__(retry_config)
         
@@ -145,25 +215,45 @@ class OllamaClient(BaseLLMClient):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout_seconds
         
-        # Reuse HTTP session for connection pooling (performance)
-        import requests
-        self._session = requests.Session()
+        # Pooled keep-alive client shared by threaded batches (generate_batch).
+        # HTTP/2 multiplexing needs TLS plus the optional h2 package; a local
+        # plain-http Ollama stays on HTTP/1.1. Retries stay in generate().
+        import httpx
+        try:
+            import h2  # noqa: F401
+            http2 = self.base_url.startswith("https://")
+        except ImportError:
+            http2 = False
+        
+        self._session = httpx.Client(
+            base_url=self.base_url,
+            http2=http2,
+            timeout=timeout_seconds,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(
+                max_keepalive_connections=max(pool_size // 2, 1),
+                max_connections=pool_size
+            )
+        )
     
     def _call_api(self, prompt: str, system_prompt: str) -> str:
-        """Make Ollama API call with session reuse."""
+        """Make Ollama API call with connection reuse."""
         response = self._session.post(
-            f"{self.base_url}/api/generate",
-            json={
+            "/api/generate",
+            content=json_dumps({
                 "model": self.model,
                 "prompt": prompt,
                 "system": system_prompt,
                 "stream": False
-            },
-            timeout=self.timeout
+            })
         )
         
         response.raise_for_status()
-        return response.json().get("response", "")
+        return json_loads(response.content).get("response", "")
+    
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
 
 
 class LLMClient:
@@ -174,15 +264,21 @@ class LLMClient:
     Usage:
         client = LLMClient()  # Auto-detects from LLM_PROVIDER env
         response = client.generate("Extract entities from: ...")
+        
+        # Deterministic extractions (replays, dev, tests): reuse identical answers
+        client = LLMClient(cache=True)
     """
     
     def __init__(
         self,
         provider: Optional[str] = None,
-        retry_config: Optional[RetryConfig] = None
+        retry_config: Optional[RetryConfig] = None,
+        cache: bool = False,
+        cache_size: int = 1024
     ):
         # Determine provider from env or explicit
         self.provider = provider or os.getenv("LLM_PROVIDER", "gemini")
+        self._cache = ResponseCache(cache_size) if cache else None
         
         # Default retry config
         retry = retry_config or RetryConfig(
@@ -205,11 +301,23 @@ class LLMClient:
         else:
             raise ValueError(f"Unknown LLM provider: {self.provider}")
         
-        logger.info(f"LLM Client initialized: provider={self.provider}")
+        logger.info("LLM Client initialized: provider=%s", self.provider)
     
     def generate(self, prompt: str, system_prompt: str = "") -> str:
-        """Generate response using configured provider."""
-        return self._client.generate(prompt, system_prompt)
+        """Generate response using configured provider (memoized when cache=True)."""
+        if self._cache is None:
+            return self._client.generate(prompt, system_prompt)
+        
+        key = ResponseCache.key(prompt, system_prompt)
+        response = self._cache.get(key)
+        if response is None:
+            response = self._client.generate(prompt, system_prompt)
+            self._cache.put(key, response)
+        return response
+    
+    def close(self) -> None:
+        """Release provider network resources."""
+        self._client.close()
     
     def extract_json(self, prompt: str, system_prompt: str = "") -> Dict[str, Any]:
         """
@@ -217,17 +325,117 @@ class LLMClient:
         Implements FR-03: Strict JSON output.
         """
         response = self.generate(prompt, system_prompt)
+        return self._parse_json_response(response)
+    
+    @staticmethod
+    def _strip_code_fence(response: str) -> str:
+        """Clean response (remove markdown code blocks if present)."""
+        return _FENCE_RE.sub("", response).strip()
+    
+    @staticmethod
+    def _parse_json_response(response: str) -> Any:
+        """
+        Parse a JSON answer, tolerating markdown fences and surrounding prose.
+        The fast path is one fence strip + json_loads; only when that fails is the
+        text sniffed for the first '{' or '[' that raw-decodes to a full value.
+        """
+        text = LLMClient._strip_code_fence(response)
+        try:
+            return json_loads(text)
+        except ValueError as error:
+            for match in _JSON_START_RE.finditer(text):
+                try:
+                    return _RAW_DECODER.raw_decode(text, match.start())[0]
+                except ValueError:
+                    continue
+            raise error
+    
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: str = "",
+        marshal_size: int = 8,
+        max_workers: int = 4,
+        max_chars: Optional[int] = None
+    ) -> List[Any]:
+        """
+        JSON answers for many prompts, marshaling `marshal_size` rows per LLM call.
+        
+        Rows are numbered in one prompt and the model returns a JSON array with one
+        item per row, so N rows share one round trip and one RPM slot. Marshals run
+        on `max_workers` threads (keep workers x marshal_size under the provider
+        RPM budget). A marshal whose answer is not an array of the right length is
+        split in half and retried, down to single extract_json() calls.
+        
+        A row that still fails on its own, or a marshal whose call raises (the
+        provider has already retried it), comes back as None; the other rows are
+        unaffected. A ValueError from generate() (a configuration error such as a
+        missing API key) is raised instead of being split into more calls.
         
-        # Clean response (remove markdown code blocks if present)
-        text = response.strip()
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
+        With `max_chars`, a marshal also closes before its rows exceed that many
+        characters, so long rows travel in smaller groups and short rows in full
+        ones (a row longer than the budget still goes alone).
         
-        return json_loads(text.strip())
+        Returns parsed JSON items (None for failed rows) in the order of `prompts`.
+        """
+        if not prompts:
+            return []
+        marshal_size = max(marshal_size, 1)
+        marshals: List[List[str]] = []
+        rows: List[str] = []
+        size = 0
+        for prompt in prompts:
+            if rows and (
+                len(rows) >= marshal_size
+                or (max_chars and size + len(prompt) > max_chars)
+            ):
+                marshals.append(rows)
+                rows, size = [], 0
+            rows.append(prompt)
+            size += len(prompt)
+        marshals.append(rows)
+        
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(min(max_workers, len(marshals)), 1)) as pool:
+            answers = pool.map(lambda rows: self._extract_marshal(rows, system_prompt), marshals)
+            return [item for marshal in answers for item in marshal]
+    
+    def _extract_marshal(self, rows: List[str], system_prompt: str) -> List[Any]:
+        if len(rows) == 1:
+            prompt = rows[0]
+        else:
+            prompt = "\n\n".join(f"Row {i}:\n{row}" for i, row in enumerate(rows, 1))
+            prompt += (
+                f"\n\nAnswer every row independently. Return a JSON array of exactly "
+                f"{len(rows)} items, item i answering Row i. JSON only."
+            )
+        
+        try:
+            response = self.generate(prompt, system_prompt)
+        except ValueError:
+            # Configuration errors (e.g. missing GEMINI_API_KEY) fail every row alike
+            raise
+        except Exception as e:
+            # Transport/API error after the provider's own retries: splitting would only multiply calls
+            logger.warning("LLM batch of %d rows failed: %s", len(rows), e)
+            return [None] * len(rows)
+        
+        # Only the parse decides whether to split: generate() errors never get here
+        try:
+            items = self._parse_json_response(response)
+        except ValueError as e:
+            items = None
+            logger.warning("LLM batch of %d rows returned invalid JSON (%s)", len(rows), e)
+        
+        if len(rows) == 1:
+            return [items]
+        if isinstance(items, list) and len(items) == len(rows):
+            return items
+        if items is not None:
+            logger.warning("LLM batch returned a malformed array for %d rows, splitting", len(rows))
+        
+        half = len(rows) // 2
+        return self._extract_marshal(rows[:half], system_prompt) + self._extract_marshal(rows[half:], system_prompt)
     
     def generate_structured(
         self,
@@ -247,10 +455,7 @@ class LLMClient:
             Validated dict matching schema
         """
         # Enhance prompt with JSON requirement
-        enhanced_system = f"""{system_prompt}
-
-IMPORTANT: Respond with valid JSON only. No markdown, no explanation.
-"""
+        enhanced_system = _json_only_system_prompt(system_prompt)
         
         # Generate and parse JSON
         data = self.extract_json(user_input, enhanced_system)
@@ -260,15 +465,15 @@ IMPORTANT: Respond with valid JSON only. No markdown, no explanation.
             try:
                 # Try to use Pydantic model for validation
                 if hasattr(response_schema, 'model_validate'):
-                    # Pydantic v2
-                    validated = response_schema.model_validate(data)
-                    return validated.model_dump()
+                    # Pydantic v2: reuse the cached adapter's compiled validator
+                    adapter = _type_adapter(response_schema)
+                    return adapter.dump_python(adapter.validate_python(data))
                 elif hasattr(response_schema, 'parse_obj'):
                     # Pydantic v1
                     validated = response_schema.parse_obj(data)
                     return validated.dict()
             except Exception as e:
-                logger.warning(f"Schema validation failed: {e}. Returning raw dict.")
+                logger.warning("Schema validation failed: %s. Returning raw dict.", e)
         
         return data
 
@@ -11,14 +11,40 @@ Features:
 
 import os
 import json
+import atexit
+import math
 import time
-from datetime import datetime
+import weakref
+from collections import Counter
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 
+# Use orjson for faster log parsing and writing (with fallback)
+try:
+    import orjson
+    json_loads = orjson.loads
+    # Native dataclass support is on by default since orjson 3; 2.x needs the flag
+    _DUMPS_OPTIONS = (
+        orjson.OPT_APPEND_NEWLINE
+        | orjson.OPT_NON_STR_KEYS
+        | getattr(orjson, "OPT_SERIALIZE_DATACLASS", 0)
+    )
 
-@dataclass
+    def _dumps_line(data: Any) -> bytes:
+        # Serializes dataclasses natively: no asdict() copy
+        return orjson.dumps(data, default=str, option=_DUMPS_OPTIONS)
+except ImportError:
+    json_loads = json.loads
+
+    def _dumps_line(data: Any) -> bytes:
+        if not isinstance(data, dict):
+            data = asdict(data)
+        return (json.dumps(data, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+
+@dataclass(frozen=True, slots=True)
 class CallRecord:
     """Immutable record of a processed call for audit."""
     call_id: str
@@ -51,12 +77,37 @@ class CallRecord:
     dispatch_units: Optional[List[str]] = None
 
 
+# Loggers to flush at interpreter exit; weak, so registration doesn't keep them alive
+_open_loggers: "weakref.WeakSet[AuditLogger]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers() -> None:
+    for audit_logger in list(_open_loggers):
+        audit_logger.close()
+
+
 class AuditLogger:
     """
     JSONL-based audit logger for call processing.
     Writes immutable records for compliance and analysis.
+    
+    Lines are appended to the day's file with one write() on an O_APPEND
+    descriptor. O_APPEND makes each write land atomically at end-of-file, so
+    several server workers can share the same daily file without locks or torn
+    lines. Call records (log()) are written through immediately; raw log_dict()
+    entries are buffered and written once the buffer reaches BUFFER_SIZE or
+    holds an entry older than FLUSH_INTERVAL seconds, at the next write, on
+    flush() or on close.
     """
     
+    BUFFER_SIZE = 1 << 16
+    FLUSH_INTERVAL = 1.0
+    OPEN_FLAGS = (
+        os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+    )
+    
     def __init__(
         self,
         log_dir: str = "logs",
@@ -64,23 +115,79 @@ class AuditLogger:
     ):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.filename_prefix = filename_prefix
         
-        # Daily log files
-        today = datetime.now().strftime("%Y-%m-%d")
-        self.log_file = self.log_dir / f"{filename_prefix}_{today}.jsonl"
+        # Daily log files: reopened when the clock passes the next local midnight
+        self._fd: Optional[int] = None
+        self._buffer = bytearray()
+        self._buffered_since = 0.0
+        self._rotate_at = 0.0
+        self._open_today()
         
         print(f"📊 Audit logging to: {self.log_file}")
     
+    def _open_today(self) -> None:
+        self.close()
+        now = datetime.now()
+        self.log_file = self.log_dir / f"{self.filename_prefix}_{now.strftime('%Y-%m-%d')}.jsonl"
+        self._fd = os.open(self.log_file, self.OPEN_FLAGS, 0o644)
+        _open_loggers.add(self)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self._rotate_at = midnight.timestamp()
+    
+    def _write(self, line: bytes, flush: bool = False) -> None:
+        now = time.time()
+        if self._fd is None or now >= self._rotate_at:
+            self._open_today()
+        if not self._buffer:
+            self._buffered_since = now
+        self._buffer += line
+        if (
+            flush
+            or len(self._buffer) >= self.BUFFER_SIZE
+            or now - self._buffered_since >= self.FLUSH_INTERVAL
+        ):
+            self.flush()
+    
     def log(self, record: CallRecord) -> None:
-        """Append a call record to the JSONL log."""
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(asdict(record), ensure_ascii=False) + '\n')
+        """Append a call record to the JSONL log (written through, not buffered)."""
+        self._write(_dumps_line(record), flush=True)
     
     def log_dict(self, data: Dict[str, Any]) -> None:
         """Log a raw dictionary (for flexibility)."""
         data['logged_at'] = datetime.now().isoformat()
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(data, ensure_ascii=False, default=str) + '\n')
+        self._write(_dumps_line(data))
+    
+    def flush(self) -> None:
+        """Push buffered records to the file."""
+        if self._fd is None or not self._buffer:
+            return
+        view = memoryview(self._buffer)
+        while view:
+            view = view[os.write(self._fd, view):]
+        view.release()
+        self._buffer.clear()
+    
+    def close(self) -> None:
+        """Flush and close the log descriptor (reopened by the next write)."""
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+        _open_loggers.discard(self)
+    
+    def __del__(self) -> None:
+        # A logger dropped without close() still writes out its buffer
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def __enter__(self) -> "AuditLogger":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 class CallAnalytics:
@@ -93,13 +200,16 @@ class CallAnalytics:
         self.log_dir = Path(log_dir)
         self._stats = {
             "total_calls": 0,
-            "by_incident_type": {},
-            "by_urgency": {},
-            "by_commune": {},
-            "avg_confidence": 0.0,
-            "human_review_count": 0,
-            "avg_processing_time_ms": 0.0
+            "by_incident_type": Counter(),
+            "by_urgency": Counter(),
+            "by_commune": Counter(),
+            "human_review_count": 0
         }
+        # Averages are derived from exact sums on read, not updated in place
+        self._sum_confidence: float = 0.0
+        self._sum_processing_ms: int = 0
+        # (key, count) leader per Counter, kept current on every increment
+        self._leaders: Dict[str, Optional[tuple]] = {}
     
     def record_call(
         self,
@@ -111,46 +221,80 @@ class CallAnalytics:
         processing_time_ms: int
     ):
         """Record a call for analytics."""
-        total = self._stats["total_calls"]
-        
         # Update counters
-        self._stats["total_calls"] = total + 1
+        self._stats["total_calls"] += 1
         
         # By incident type
-        self._stats["by_incident_type"][incident_type] = \
-            self._stats["by_incident_type"].get(incident_type, 0) + 1
+        self._bump("by_incident_type", incident_type)
         
         # By urgency
-        self._stats["by_urgency"][urgency] = \
-            self._stats["by_urgency"].get(urgency, 0) + 1
+        self._stats["by_urgency"][urgency] += 1
         
         # By commune
         if commune:
-            self._stats["by_commune"][commune] = \
-                self._stats["by_commune"].get(commune, 0) + 1
+            self._bump("by_commune", commune)
         
-        # Running averages
-        if total > 0:
-            self._stats["avg_confidence"] = (
-                (self._stats["avg_confidence"] * total + confidence) / (total + 1)
-            )
-            self._stats["avg_processing_time_ms"] = (
-                (self._stats["avg_processing_time_ms"] * total + processing_time_ms) / (total + 1)
-            )
-        else:
-            self._stats["avg_confidence"] = confidence
-            self._stats["avg_processing_time_ms"] = float(processing_time_ms)
+        # Sums for the averages
+        self._sum_confidence += confidence
+        self._sum_processing_ms += processing_time_ms
         
         # Human review
         if needs_review:
             self._stats["human_review_count"] += 1
     
+    def _record_columns(
+        self,
+        incident_types: List[str],
+        urgencies: List[str],
+        communes: List[str],
+        confidences: List[float],
+        processing_times_ms: List[int],
+        review_count: int
+    ):
+        """
+        Record a batch of calls given column-wise.
+        Each categorical column is counted in one Counter.update (C loop).
+        """
+        n = len(incident_types)
+        if n == 0:
+            return
+        self._stats["total_calls"] += n
+        
+        self._stats["by_incident_type"].update(incident_types)
+        self._stats["by_urgency"].update(urgencies)
+        self._stats["by_commune"].update(communes)
+        self._leaders.clear()
+        
+        self._sum_confidence += math.fsum(confidences)
+        self._sum_processing_ms += sum(processing_times_ms)
+        
+        self._stats["human_review_count"] += review_count
+    
+    def _bump(self, field: str, key: str) -> None:
+        """Increment a Counter and challenge its cached leader."""
+        counter = self._stats[field]
+        counter[key] += 1
+        leader = self._leaders.get(field)
+        if leader is not None and counter[key] > leader[1]:
+            self._leaders[field] = (key, counter[key])
+    
+    def _top(self, field: str, default: str) -> str:
+        """Most frequent key of a Counter; O(1) unless a bulk load reset the cache."""
+        leader = self._leaders.get(field)
+        if leader is None:
+            top = self._stats[field].most_common(1)
+            if not top:
+                return default
+            leader = self._leaders[field] = top[0]
+        return leader[0]
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get current analytics stats."""
         stats = self._stats.copy()
-        stats["human_review_rate"] = (
-            self._stats["human_review_count"] / max(self._stats["total_calls"], 1)
-        )
+        total = max(self._stats["total_calls"], 1)
+        stats["avg_confidence"] = self._sum_confidence / total
+        stats["avg_processing_time_ms"] = self._sum_processing_ms / total
+        stats["human_review_rate"] = self._stats["human_review_count"] / total
         return stats
     
     def get_kpis(self) -> Dict[str, Any]:
@@ -158,19 +302,11 @@ class CallAnalytics:
         total = max(self._stats["total_calls"], 1)
         return {
             "total_processed": self._stats["total_calls"],
-            "avg_confidence": round(self._stats["avg_confidence"], 3),
+            "avg_confidence": round(self._sum_confidence / total, 3),
             "human_review_rate": round(self._stats["human_review_count"] / total, 3),
-            "avg_response_time_ms": round(self._stats["avg_processing_time_ms"], 1),
-            "top_incident_type": max(
-                self._stats["by_incident_type"].items(),
-                key=lambda x: x[1],
-                default=("NONE", 0)
-            )[0],
-            "top_commune": max(
-                self._stats["by_commune"].items(),
-                key=lambda x: x[1],
-                default=("UNKNOWN", 0)
-            )[0]
+            "avg_response_time_ms": round(self._sum_processing_ms / total, 1),
+            "top_incident_type": self._top("by_incident_type", "NONE"),
+            "top_commune": self._top("by_commune", "UNKNOWN")
         }
     
     def generate_heatmap_data(self) -> Dict[str, Any]:
@@ -182,44 +318,70 @@ class CallAnalytics:
             "generated_at": datetime.now().isoformat()
         }
     
+    @staticmethod
+    def _read_records(log_file: Path) -> List[Dict[str, Any]]:
+        """
+        Parse a day's JSONL in one call by framing its lines as a JSON array.
+        Falls back to per-line parsing (skipping bad lines) if any line is invalid.
+        """
+        lines = [line for line in log_file.read_bytes().splitlines() if line.strip()]
+        try:
+            records = json_loads(b"[" + b",".join(lines) + b"]")
+            if len(records) == len(lines) and all(isinstance(r, dict) for r in records):
+                return records
+        except ValueError:
+            pass
+        
+        records = []
+        for line in lines:
+            try:
+                record = json_loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
+    
     def load_from_logs(self, days: int = 7):
         """Load historical data from JSONL logs."""
-        from datetime import timedelta
-        
         for i in range(days):
             date = datetime.now() - timedelta(days=i)
             date_str = date.strftime("%Y-%m-%d")
             log_file = self.log_dir / f"calls_{date_str}.jsonl"
             
-            if log_file.exists():
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        try:
-                            record = json.loads(line)
-                            self.record_call(
-                                incident_type=record.get("incident_type", "UNKNOWN"),
-                                urgency=record.get("urgency", "UNKNOWN"),
-                                commune=record.get("location", {}).get("commune"),
-                                confidence=record.get("confidence", 0.0),
-                                needs_review=record.get("needs_human_review", False),
-                                processing_time_ms=record.get("processing_time_ms", 0)
-                            )
-                        except json.JSONDecodeError:
-                            continue
+            if not log_file.exists():
+                continue
+            
+            records = self._read_records(log_file)
+            
+            # Aggregate the day column-wise: one comprehension per field
+            communes = [
+                commune for commune in ((r.get("location") or {}).get("commune") for r in records)
+                if commune
+            ]
+            self._record_columns(
+                [r.get("incident_type", "UNKNOWN") for r in records],
+                [r.get("urgency", "UNKNOWN") for r in records],
+                communes,
+                [r.get("confidence", 0.0) for r in records],
+                [r.get("processing_time_ms", 0) for r in records],
+                sum(1 for r in records if r.get("needs_human_review", False))
+            )
 
 
 class ProcessingTimer:
     """Context manager for timing pipeline processing."""
     
     def __init__(self):
-        self.start_time = None
-        self.end_time = None
+        self.start_ns = None
+        self.end_ns = None
         self.elapsed_ms = 0
     
     def __enter__(self):
-        self.start_time = time.perf_counter()
+        self.start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, *args):
-        self.end_time = time.perf_counter()
-        self.elapsed_ms = int((self.end_time - self.start_time) * 1000)
+        # Integer nanoseconds: no float rounding, floor to whole milliseconds
+        self.end_ns = time.perf_counter_ns()
+        self.elapsed_ms = (self.end_ns - self.start_ns) // 1_000_000
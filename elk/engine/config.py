@@ -8,9 +8,10 @@ Best practice configuration management with:
 """
 
 import os
+import hashlib
 from typing import Optional, List
 from pathlib import Path
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import BaseModel, Field, PrivateAttr, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -114,16 +115,41 @@ class ELKSettings(BaseSettings):
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
     server: ServerSettings = Field(default_factory=ServerSettings)
     
+    # Resolved once per settings instance; reload_settings() builds a new one on env change
+    _api_key: Optional[str] = PrivateAttr(default=None)
+    _api_key_resolved: bool = PrivateAttr(default=False)
+    
     def get_llm_api_key(self) -> Optional[str]:
         """Get API key as string (for use with clients)."""
-        if self.llm.cloud_api_key:
-            return self.llm.cloud_api_key.get_secret_value()
-        # Fallback to direct env var
-        return os.getenv("GEMINI_API_KEY")
+        if not self._api_key_resolved:
+            if self.llm.cloud_api_key:
+                self._api_key = self.llm.cloud_api_key.get_secret_value()
+            else:
+                # Fallback to direct env var
+                self._api_key = os.getenv("GEMINI_API_KEY")
+            self._api_key_resolved = True
+        return self._api_key
 
 
 # Global settings instance (singleton pattern)
 _settings: Optional[ELKSettings] = None
+_settings_snapshot: Optional[bytes] = None
+
+
+def _env_snapshot() -> bytes:
+    """
+    Digest of everything settings read: ELK_* variables, GEMINI_API_KEY and the
+    .env mtime. Only the digest is kept, so secrets are not held twice in memory.
+    """
+    try:
+        env_file_mtime = os.stat(".env").st_mtime_ns
+    except OSError:
+        env_file_mtime = None
+    relevant = sorted(
+        (k, v) for k, v in os.environ.items()
+        if k.upper().startswith("ELK_") or k == "GEMINI_API_KEY"
+    )
+    return hashlib.blake2b(repr((env_file_mtime, relevant)).encode(), digest_size=16).digest()
 
 
 def get_settings() -> ELKSettings:
@@ -131,14 +157,18 @@ def get_settings() -> ELKSettings:
     Get or create settings instance.
     Use this function for dependency injection in FastAPI.
     """
-    global _settings
+    global _settings, _settings_snapshot
     if _settings is None:
+        _settings_snapshot = _env_snapshot()
         _settings = ELKSettings()
     return _settings
 
 
 def reload_settings() -> ELKSettings:
-    """Force reload settings (useful after env changes)."""
-    global _settings
-    _settings = ELKSettings()
+    """Force reload settings (useful after env changes); a no-op when nothing changed."""
+    global _settings, _settings_snapshot
+    snapshot = _env_snapshot()
+    if _settings is None or snapshot != _settings_snapshot:
+        _settings_snapshot = snapshot
+        _settings = ELKSettings()
     return _settings
@@ -4,13 +4,20 @@ Cross-encoder reranking for improved retrieval precision.
 Best practice from LangChain: rerank results before LLM context.
 """
 
+import os
+import heapq
+import hashlib
 import logging
-from typing import List, Tuple, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
 
 logger = logging.getLogger(__name__)
 
+ONNX_CACHE_DIR = Path(os.getenv("ELK_ONNX_CACHE", Path.home() / ".cache" / "elk" / "onnx"))
+
 
 @dataclass
 class RankedResult:
@@ -26,6 +33,144 @@ class RankedResult:
         return self.rerank_score if self.rerank_score is not None else self.original_score
 
 
+class OnnxCrossEncoder:
+    """
+    INT8 cross-encoder served by ONNX Runtime.
+    
+    Exposes the same `predict(pairs, batch_size, show_progress_bar)` surface as
+    sentence-transformers' CrossEncoder so the reranker can swap it in.
+    The export and dynamic quantization run once and are cached on disk.
+    
+    Document token ids are cached (LRU keyed by a blake2b digest of the text), so
+    a static knowledge base is tokenized once; only the query is tokenized per call
+    and the [CLS] query [SEP] doc [SEP] rows are assembled directly.
+    """
+    
+    def __init__(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        max_length: int = 512,
+        token_cache_size: int = 10_000
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        model_path = self._quantized_model(model_name)
+        providers = ["CPUExecutionProvider"]
+        if device and device.startswith("cuda"):
+            providers.insert(0, "CUDAExecutionProvider")
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.session = ort.InferenceSession(str(model_path), providers=providers)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_length = max_length
+        self.token_cache_size = token_cache_size
+        self._doc_tokens: "OrderedDict[bytes, List[int]]" = OrderedDict()
+        # Row assembly assumes a BERT-style pair layout (segment ids included);
+        # RoBERTa-style models (no token_type_ids input) go through the tokenizer
+        self._pair_layout = (
+            "token_type_ids" in self.input_names
+            and self.tokenizer.cls_token_id is not None
+            and self.tokenizer.sep_token_id is not None
+        )
+    
+    @staticmethod
+    def _quantized_model(model_name: str) -> Path:
+        """Export to ONNX and quantize weights to INT8, reusing a cached copy."""
+        target = ONNX_CACHE_DIR / model_name.replace("/", "__")
+        quantized = target / "model_quantized.onnx"
+        if quantized.exists():
+            return quantized
+        
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        logger.info(f"Exporting {model_name} to ONNX (INT8) in {target}")
+        ORTModelForSequenceClassification.from_pretrained(model_name, export=True).save_pretrained(target)
+        quantize_dynamic(str(target / "model.onnx"), str(quantized), weight_type=QuantType.QInt8)
+        return quantized
+    
+    def _doc_ids(self, doc: str) -> List[int]:
+        """Token ids of a document without special tokens, from the LRU when seen before."""
+        key = hashlib.blake2b(doc.encode(), digest_size=16).digest()
+        ids = self._doc_tokens.get(key)
+        if ids is not None:
+            self._doc_tokens.move_to_end(key)
+            return ids
+        
+        ids = self.tokenizer(
+            doc, add_special_tokens=False, truncation=True, max_length=self.max_length
+        )["input_ids"]
+        self._doc_tokens[key] = ids
+        if len(self._doc_tokens) > self.token_cache_size:
+            self._doc_tokens.popitem(last=False)
+        return ids
+    
+    def _encode_cached(self, batch) -> Dict[str, Any]:
+        """Assemble padded pair inputs from per-call query ids and cached doc ids."""
+        import numpy as np
+        
+        cls_id, sep_id = self.tokenizer.cls_token_id, self.tokenizer.sep_token_id
+        pad_id = self.tokenizer.pad_token_id or 0
+        # Same split as truncation="longest_first" in the common short-query case
+        query_budget = self.max_length // 2
+        
+        query_ids: Dict[str, List[int]] = {}
+        rows = []
+        for query, doc in batch:
+            q_ids = query_ids.get(query)
+            if q_ids is None:
+                q_ids = query_ids[query] = self.tokenizer(
+                    query, add_special_tokens=False, truncation=True, max_length=query_budget
+                )["input_ids"]
+            d_ids = self._doc_ids(doc)[:self.max_length - len(q_ids) - 3]
+            rows.append(([cls_id, *q_ids, sep_id], [*d_ids, sep_id]))
+        
+        width = max(len(a) + len(b) for a, b in rows)
+        input_ids = np.full((len(rows), width), pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(rows), width), dtype=np.int64)
+        token_type_ids = np.zeros((len(rows), width), dtype=np.int64)
+        for i, (first, second) in enumerate(rows):
+            n = len(first) + len(second)
+            input_ids[i, :n] = first + second
+            attention_mask[i, :n] = 1
+            token_type_ids[i, len(first):n] = 1
+        
+        return {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": token_type_ids
+        }
+    
+    def predict(self, pairs, batch_size: int = 32, show_progress_bar: bool = False) -> List[float]:
+        import numpy as np
+        
+        scores: List[float] = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            if self._pair_layout:
+                encoded = self._encode_cached(batch)
+            else:
+                encoded = self.tokenizer(
+                    [q for q, _ in batch],
+                    [d for _, d in batch],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="np"
+                )
+            feeds = {k: v for k, v in encoded.items() if k in self.input_names}
+            logits = self.session.run(None, feeds)[0]
+            first = logits[:, 0].astype("float64")
+            if logits.shape[1] == 1:
+                # Same scale as CrossEncoder.predict (sigmoid on single-label models),
+                # so score thresholds behave identically on both backends
+                first = 1.0 / (1.0 + np.exp(-first))
+            scores.extend(first.tolist())
+        return scores
+
+
 class CrossEncoderReranker:
     """
     Cross-encoder reranker for improved retrieval precision.
@@ -39,7 +184,9 @@ class CrossEncoderReranker:
     def __init__(
         self,
         model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        batch_size: int = 32,
+        backend: Optional[str] = None
     ):
         """
         Initialize cross-encoder.
@@ -47,17 +194,34 @@ class CrossEncoderReranker:
         Args:
             model_name: HuggingFace model name for cross-encoder
             device: 'cuda', 'cpu', or None for auto-detect
+            batch_size: Pairs per forward pass
+            backend: 'torch' or 'onnx' (INT8); defaults to ELK_RERANK_BACKEND
         """
         self.model_name = model_name
         self.device = device
+        self.batch_size = batch_size
+        self.backend = backend or os.getenv("ELK_RERANK_BACKEND", "torch")
         self._model = None
     
     def _load_model(self):
         """Lazy load cross-encoder model."""
+        if self._model is None and self.backend == "onnx":
+            try:
+                self._model = OnnxCrossEncoder(self.model_name, device=self.device)
+                logger.info(f"Loaded INT8 ONNX reranker: {self.model_name}")
+            except ImportError as e:
+                logger.warning(
+                    f"ONNX reranker unavailable ({e}). Falling back to sentence-transformers. "
+                    "Install with: pip install optimum[onnxruntime]"
+                )
         if self._model is None:
             try:
                 from sentence_transformers import CrossEncoder
                 self._model = CrossEncoder(self.model_name, device=self.device)
+                # FP16 on GPU: roughly doubles throughput, scores are unaffected for ranking
+                device = getattr(self._model, "device", None) or getattr(self._model, "_target_device", "")
+                if str(device).startswith("cuda") and hasattr(self._model, "model"):
+                    self._model.model.half()
                 logger.info(f"Loaded reranker: {self.model_name}")
             except ImportError:
                 logger.warning(
@@ -67,6 +231,28 @@ class CrossEncoderReranker:
                 raise
         return self._model
     
+    def _predict(self, query: str, documents: List[str]) -> List[float]:
+        """
+        Score (query, doc) pairs in length-sorted batches.
+        Each batch is padded to its longest pair, so grouping similar lengths
+        avoids spending attention FLOPs on padding. Scores come back in input order.
+        """
+        model = self._load_model()
+        order = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+        scores = [0.0] * len(documents)
+        
+        bs = self.batch_size
+        for start in range(0, len(order), bs):
+            batch = order[start:start + bs]
+            batch_scores = model.predict(
+                [(query, documents[i]) for i in batch],
+                batch_size=bs,
+                show_progress_bar=False
+            )
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+        return scores
+    
     def rerank(
         self,
         query: str,
@@ -87,13 +273,8 @@ class CrossEncoderReranker:
         if not documents:
             return []
         
-        model = self._load_model()
-        
-        # Create query-document pairs
-        pairs = [(query, doc) for doc in documents]
-        
         # Get relevance scores
-        scores = model.predict(pairs)
+        scores = self._predict(query, documents)
         
         # Sort by score descending
         scored_docs = sorted(
@@ -124,17 +305,12 @@ class CrossEncoderReranker:
         if not results:
             return []
         
-        model = self._load_model()
-        
-        # Create query-document pairs
-        pairs = [(query, r.document) for r in results]
-        
         # Get relevance scores
-        scores = model.predict(pairs)
+        scores = self._predict(query, [r.document for r in results])
         
         # Update rerank scores
         for result, score in zip(results, scores):
-            result.rerank_score = float(score)
+            result.rerank_score = score
         
         # Sort by rerank score descending
         sorted_results = sorted(results, key=lambda r: r.final_score, reverse=True)
@@ -159,7 +335,8 @@ class MinScoreFilter:
 def create_reranking_pipeline(
     use_reranker: bool = True,
     min_score: float = 0.3,
-    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+    pre_filter_k: int = 20
 ):
     """
     Factory function to create reranking pipeline.
@@ -168,6 +345,8 @@ def create_reranking_pipeline(
         use_reranker: Whether to use cross-encoder (requires sentence-transformers)
         min_score: Minimum score threshold
         rerank_model: Model name for cross-encoder
+        pre_filter_k: Candidates (by original_score) the cross-encoder scores,
+            never fewer than top_n * 2
         
     Returns:
         Callable that takes (query, results) and returns filtered, reranked results
@@ -189,6 +368,10 @@ def create_reranking_pipeline(
         """Apply reranking and filtering pipeline."""
         
         if reranker:
+            # Cheap pre-filter: low retrieval scores rarely survive the cross-encoder
+            keep = max(top_n * 2, pre_filter_k)
+            if len(results) > keep:
+                results = heapq.nlargest(keep, results, key=lambda r: r.original_score)
             results = reranker.rerank_with_metadata(query, results, top_n=top_n * 2)
         
         results = score_filter.filter(results)
@@ -12,15 +12,28 @@ Features:
 
 import os
 import re
+import json
+import heapq
+import hashlib
 import logging
+import tempfile
+import uuid
+from collections import OrderedDict
 from functools import lru_cache
-from typing import List, Dict, Any, Optional, Tuple
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Optional: single-pass multi-term matching for keyword search
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-@dataclass
+
+@dataclass(slots=True)
 class RAGResult:
     """Single RAG retrieval result."""
     text: str
@@ -29,37 +42,128 @@ class RAGResult:
     source: str  # "vector" or "keyword"
 
 
+# Ids index_lexicon() assigns (add_documents() uses doc_<uuid>)
+_LEXICON_ID_RE = re.compile(r"(?:commune|quartier|vocab)_\d+")
+
+
+# Cached keyword match tuple -> RAGResult, by match kind
+_KEYWORD_RESULTS = {
+    'commune': lambda item: RAGResult(
+        text=f"DETECTED_LOCATION: {item[0].title()} (Commune de Bejaia)",
+        score=item[2],
+        metadata={"type": "commune", "name": item[0]},
+        source="keyword"
+    ),
+    'quartier': lambda item: RAGResult(
+        text=f"DETECTED_LANDMARK: {item[0].title()} (Quartier connu)",
+        score=item[2],
+        metadata={"type": "quartier", "name": item[0]},
+        source="keyword"
+    ),
+    'vocab': lambda item: RAGResult(
+        text=f"DETECTED_VOCAB: {item[0]} -> {item[3]}",
+        score=item[2],
+        metadata={"type": "vocab", "kabyle": item[0], "french": item[3]},
+        source="keyword"
+    ),
+}
+
+
 class VectorStore:
     """
     ChromaDB-based vector store for semantic search.
     Stores embeddings for locations, vocabulary, and procedures.
+    
+    Query embeddings and hit lists are kept in per-instance LRUs, so repeated
+    triage queries skip both the embedder forward pass and the index lookup.
+    
+    HNSW tuning (pack lexicons are hundreds to low thousands of docs):
+    - hnsw_M / hnsw_ef_construction: denser graph, better recall; paid once at
+      indexing time, negligible at this scale.
+    - hnsw_ef_search: beam width per query; higher means better recall and
+      proportionally more distance computations (latency), the per-query knob.
+    Chroma applies construction settings only when the collection is created.
+    
+    Storage is persistent by default (under the temp dir when no path is given),
+    so a restarted process reopens the built HNSW graph instead of re-embedding
+    and re-indexing the pack; pass persist_path=False for a throwaway store.
     """
     
+    QUERY_CACHE_SIZE = 512
+    INDEX_BATCH_SIZE = 256
+    
     def __init__(
         self,
         collection_name: str = "elk_knowledge",
-        persist_path: Optional[str] = None
+        persist_path: Union[str, bool, None] = None,
+        hnsw_M: int = 24,
+        hnsw_ef_construction: int = 128,
+        hnsw_ef_search: int = 100
     ):
         import chromadb
+        from chromadb.utils import embedding_functions
         
         self.collection_name = collection_name
         
-        # Use persistent storage if path provided
-        if persist_path:
-            os.makedirs(persist_path, exist_ok=True)
-            self.client = chromadb.PersistentClient(path=persist_path)
-            logger.info(f"ChromaDB persisting to: {persist_path}")
+        # Persistent storage unless explicitly disabled
+        if persist_path is None or persist_path is True:
+            persist_path = os.path.join(tempfile.gettempdir(), "elk_chroma", collection_name)
+        self.persist_path = persist_path or None
+        
+        if self.persist_path:
+            os.makedirs(self.persist_path, exist_ok=True)
+            self.client = chromadb.PersistentClient(path=self.persist_path)
+            logger.info(f"ChromaDB persisting to: {self.persist_path}")
         else:
             self.client = chromadb.Client()
             logger.info("ChromaDB in-memory mode")
         
-        # Get or create collection (auto-embeds with default model)
+        # Get or create collection (auto-embeds with default model). The embedder is
+        # held here too so queries can be embedded once and reused.
+        self._embedder = embedding_functions.DefaultEmbeddingFunction()
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+            embedding_function=self._embedder,
+            metadata={
+                "hnsw:space": "cosine",  # Use cosine similarity
+                "hnsw:M": hnsw_M,
+                "hnsw:construction_ef": hnsw_ef_construction,
+                "hnsw:search_ef": hnsw_ef_search,
+                "hnsw:num_threads": os.cpu_count() or 4
+            }
         )
         
-        logger.info(f"Collection '{collection_name}' ready ({self.collection.count()} docs)")
+        # text -> (int8 vector, scale): a quarter of the float32 footprint
+        self._embeddings: "OrderedDict[str, tuple]" = OrderedDict()
+        self._hits: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+        # Document count, refreshed after our own writes so queries skip the count() call
+        self._doc_count = self.collection.count()
+        
+        logger.info(f"Collection '{collection_name}' ready ({self._doc_count} docs)")
+    
+    def _embed(self, text: str) -> List[float]:
+        """Query embedding, computed once per distinct text and cached as int8."""
+        from ._simd import quantize_i8, dequantize_i8
+        
+        cached = self._embeddings.get(text)
+        if cached is not None:
+            self._embeddings.move_to_end(text)
+        else:
+            cached = self._embeddings[text] = quantize_i8(self._embedder([text])[0])
+            if len(self._embeddings) > self.QUERY_CACHE_SIZE:
+                self._embeddings.popitem(last=False)
+        return dequantize_i8(*cached).tolist()
+    
+    def _add(self, upsert: bool = False, **kwargs) -> None:
+        """Add (or upsert) to the collection; cached hit lists are stale afterwards."""
+        if upsert:
+            self.collection.upsert(**kwargs)
+        else:
+            self.collection.add(**kwargs)
+        self._hits.clear()
+        # Re-read rather than add len(ids): duplicate ids are ignored by Chroma
+        self._doc_count = self.collection.count()
     
     def add_documents(
         self,
@@ -74,17 +178,17 @@ class VectorStore:
         if not documents:
             return 0
         
-        # Generate IDs if not provided
+        # Generate IDs if not provided (random: count()-based ids would collide
+        # with surviving doc_ ids once lexicon entries are deleted)
         if ids is None:
-            existing = self.collection.count()
-            ids = [f"doc_{existing + i}" for i in range(len(documents))]
+            ids = [f"doc_{uuid.uuid4().hex}" for _ in documents]
         
         # Default metadata if not provided
         if metadatas is None:
             metadatas = [{"source": "unknown"} for _ in documents]
         
         # Add to collection
-        self.collection.add(
+        self._add(
             documents=documents,
             metadatas=metadatas,
             ids=ids
@@ -102,33 +206,85 @@ class VectorStore:
         Semantic search in vector store.
         Returns top-k most similar documents.
         """
-        if self.collection.count() == 0:
-            return []
+        key = (query_text, n_results, repr(filter_metadata))
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._search(query_text, n_results, filter_metadata)
+            self._hits[key] = hits
+            if len(self._hits) > self.QUERY_CACHE_SIZE:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
+        
+        # Fresh objects: callers reweight scores in place
+        return [
+            RAGResult(text=doc, score=score, metadata=dict(metadata), source="vector")
+            for doc, score, metadata in hits
+        ]
+    
+    def _search(
+        self,
+        query_text: str,
+        n_results: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> tuple:
+        """Uncached index lookup: (document, score, metadata) triples."""
+        count = self._doc_count
+        if count == 0:
+            return ()
         
         results = self.collection.query(
-            query_texts=[query_text],
-            n_results=min(n_results, self.collection.count()),
+            query_embeddings=[self._embed(query_text)],
+            n_results=min(n_results, count),
             where=filter_metadata,
             include=["documents", "distances", "metadatas"]
         )
         
-        rag_results = []
-        if results["documents"] and results["documents"][0]:
-            for i, doc in enumerate(results["documents"][0]):
-                distance = results["distances"][0][i] if results["distances"] else 1.0
-                metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-                
-                # Convert distance to similarity score (cosine distance: 0=identical, 2=opposite)
-                score = max(0, 1 - (distance / 2))
-                
-                rag_results.append(RAGResult(
-                    text=doc,
-                    score=score,
-                    metadata=metadata,
-                    source="vector"
-                ))
-        
-        return rag_results
+        docs = results["documents"][0] if results["documents"] else []
+        distances = results["distances"][0] if results["distances"] else [1.0] * len(docs)
+        metadatas = results["metadatas"][0] if results["metadatas"] else [{}] * len(docs)
+        
+        # Convert distance to similarity score (cosine distance: 0=identical, 2=opposite)
+        return tuple(
+            (doc, max(0, 1 - (distance / 2)), metadata or {})
+            for doc, distance, metadata in zip(docs, distances, metadatas)
+        )
+    
+    def rerank(
+        self,
+        query_embedding,
+        doc_embeddings,
+        top_k: Optional[int] = None,
+        int8: bool = False
+    ) -> List[Tuple[int, float]]:
+        """
+        Re-score candidate embeddings against a query in-process.
+        For merging or trimming candidates fetched outside the index (e.g. an
+        over-fetched, post-filtered hit list); uses the SIMD kernels in _simd.
+        With int8=True vectors are quantized first (4x less memory traffic,
+        near-identical ordering).
+        
+        Returns:
+            (candidate index, cosine similarity) pairs, best first
+        """
+        if len(doc_embeddings) == 0:
+            return []
+        
+        import numpy as np
+        from ._simd import cosine_scores, cosine_scores_i8, quantize_i8
+        
+        if int8:
+            scores = cosine_scores_i8(
+                quantize_i8(query_embedding)[0],
+                np.ascontiguousarray([quantize_i8(d)[0] for d in doc_embeddings])
+            )
+        else:
+            scores = cosine_scores(
+                np.ascontiguousarray(query_embedding, dtype=np.float32),
+                np.ascontiguousarray(doc_embeddings, dtype=np.float32)
+            )
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [(int(i), float(scores[i])) for i in order]
     
     def index_lexicon(
         self,
@@ -136,32 +292,68 @@ class VectorStore:
         quartiers: List[str],
         vocab: Dict[str, str]
     ) -> int:
-        """Index location and vocabulary data from pack lexicon."""
-        docs = []
-        metas = []
-        ids = []
-        
-        # Index communes
-        for i, commune in enumerate(communes):
-            docs.append(f"Commune de Bejaia: {commune}")
-            metas.append({"type": "commune", "name": commune})
-            ids.append(f"commune_{i}")
-        
-        # Index quartiers
-        for i, quartier in enumerate(quartiers):
-            docs.append(f"Quartier connu de Bejaia: {quartier}")
-            metas.append({"type": "quartier", "name": quartier})
-            ids.append(f"quartier_{i}")
-        
-        # Index vocabulary mappings
-        for i, (kabyle, french) in enumerate(vocab.items()):
-            docs.append(f"Vocabulaire Kabyle: {kabyle} signifie {french}")
-            metas.append({"type": "vocab", "kabyle": kabyle, "french": french})
-            ids.append(f"vocab_{i}")
-        
-        if docs:
-            self.collection.add(documents=docs, metadatas=metas, ids=ids)
+        """
+        Index location and vocabulary data from pack lexicon.
+        Embeddings are computed by us in INDEX_BATCH_SIZE chunks (one model
+        pass each) and handed to Chroma alongside the documents.
+        """
+        docs = (
+            [f"Commune de Bejaia: {commune}" for commune in communes]
+            + [f"Quartier connu de Bejaia: {quartier}" for quartier in quartiers]
+            + [f"Vocabulaire Kabyle: {kabyle} signifie {french}" for kabyle, french in vocab.items()]
+        )
+        metas = (
+            [{"type": "commune", "name": commune} for commune in communes]
+            + [{"type": "quartier", "name": quartier} for quartier in quartiers]
+            + [{"type": "vocab", "kabyle": kabyle, "french": french} for kabyle, french in vocab.items()]
+        )
+        ids = (
+            [f"commune_{i}" for i in range(len(communes))]
+            + [f"quartier_{i}" for i in range(len(quartiers))]
+            + [f"vocab_{i}" for i in range(len(vocab))]
+        )
         
+        # Skip the rebuild when this exact lexicon is already in the persisted index
+        digest = hashlib.blake2b(
+            json.dumps([docs, metas, ids], ensure_ascii=False).encode(), digest_size=16
+        ).hexdigest()
+        marker = (
+            os.path.join(self.persist_path, f"{self.collection_name}.lexicon-hash")
+            if self.persist_path else None
+        )
+        if marker and self._doc_count and os.path.exists(marker):
+            with open(marker, encoding="utf-8") as f:
+                if f.read().strip() == digest:
+                    logger.info("Lexicon unchanged, reusing persisted vector index")
+                    return 0
+        
+        # Ids are positional, so a changed lexicon must overwrite them (add()
+        # would keep the old documents) and drop the ones past its new end
+        bs = self.INDEX_BATCH_SIZE
+        for start in range(0, len(docs), bs):
+            batch = docs[start:start + bs]
+            self._add(
+                upsert=True,
+                documents=batch,
+                embeddings=self._embedder(batch),
+                metadatas=metas[start:start + bs],
+                ids=ids[start:start + bs]
+            )
+        
+        keep = set(ids)
+        stale = [
+            doc_id for doc_id in self.collection.get(include=[])["ids"]
+            if _LEXICON_ID_RE.fullmatch(doc_id) and doc_id not in keep
+        ]
+        if stale:
+            self.collection.delete(ids=stale)
+            self._hits.clear()
+            self._doc_count = self.collection.count()
+        
+        # Written last: the marker only ever describes a fully rebuilt index
+        if marker:
+            with open(marker, "w", encoding="utf-8") as f:
+                f.write(digest)
         return len(docs)
 
 
@@ -189,6 +381,13 @@ class HybridRAG:
         self._communes: List[str] = []
         self._quartiers: List[str] = []
         self._vocab: Dict[str, str] = {}
+        
+        # Compiled term matchers (see _build_matchers); version keys the LRU cache
+        self._term_payloads: Dict[str, tuple] = {}
+        self._ac = None
+        self._trigram_index: Dict[str, tuple] = {}
+        self._short_terms: tuple = ()
+        self._ac_version = 0
     
     def load_pack_knowledge(
         self,
@@ -201,9 +400,10 @@ class HybridRAG:
         self._communes = tuple(c.lower() for c in communes)
         self._quartiers = tuple(q.lower() for q in quartiers)
         self._vocab = {k.lower(): v for k, v in vocab.items()}
-        self._vocab_frozen = tuple(sorted(self._vocab.items()))
+        self._build_matchers()
         
         # Clear keyword cache when knowledge changes
+        self._ac_version += 1
         self._keyword_search_cached.cache_clear()
         
         # Index into vector store if available
@@ -211,30 +411,75 @@ class HybridRAG:
             count = self.vector_store.index_lexicon(communes, quartiers, vocab)
             logger.info(f"Indexed {count} items into vector store")
     
+    def _build_matchers(self) -> None:
+        """
+        Compile all terms into one matcher so a text is scanned once instead of
+        once per term: an Aho-Corasick automaton when pyahocorasick is
+        installed, else a trigram index (see _trigram_candidates).
+        
+        Each term maps to its (position, payload) list: position keeps the
+        communes/quartiers/vocab reporting order, and a word may be both a
+        commune and a quartier.
+        """
+        entries = [(commune, 'commune', 1.0) for commune in self._communes]
+        entries += [(quartier, 'quartier', 1.0) for quartier in self._quartiers]
+        entries += [(kabyle, 'vocab', 0.9, french) for kabyle, french in self._vocab.items()]
+        
+        payloads: Dict[str, List[tuple]] = {}
+        for position, entry in enumerate(entries):
+            if entry[0]:
+                payloads.setdefault(entry[0], []).append((position, entry))
+        self._term_payloads = {term: tuple(matches) for term, matches in payloads.items()}
+        
+        self._ac = None
+        self._trigram_index = {}
+        self._short_terms = ()
+        if not payloads:
+            return
+        
+        if ahocorasick is not None:
+            self._ac = ahocorasick.Automaton()
+            for term, matches in self._term_payloads.items():
+                self._ac.add_word(term, matches)
+            self._ac.make_automaton()
+            return
+        
+        # A term can only occur if its leading trigram occurs in the text, so
+        # terms are bucketed by that trigram; shorter terms are always checked.
+        index: Dict[str, List[str]] = {}
+        for term in payloads:
+            if len(term) >= 3:
+                index.setdefault(term[:3], []).append(term)
+        self._trigram_index = {gram: tuple(terms) for gram, terms in index.items()}
+        self._short_terms = tuple(term for term in payloads if len(term) < 3)
+    
+    def _trigram_candidates(self, text_lower: str):
+        """
+        Terms that may occur in the text: exact negative filter. A query with no
+        pack trigram in common exits after one set intersection, and positives
+        are confirmed with C-level substring checks on the few candidates only.
+        """
+        grams = {text_lower[i:i + 3] for i in range(len(text_lower) - 2)}
+        for gram in grams & self._trigram_index.keys():
+            yield from self._trigram_index[gram]
+        yield from self._short_terms
+    
     @lru_cache(maxsize=256)
-    def _keyword_search_cached(self, text_lower: str, _communes_hash: int, _vocab_hash: int) -> tuple:
+    def _keyword_search_cached(self, text_lower: str, _version: int) -> tuple:
         """
         Cached keyword search (internal).
-        Hash params ensure cache invalidation on knowledge change.
+        The knowledge version param ensures cache invalidation on reload.
         """
-        results = []
-        
-        # Match communes (exact substring)
-        for commune in self._communes:
-            if commune in text_lower:
-                results.append((commune, 'commune', 1.0))
-        
-        # Match quartiers
-        for quartier in self._quartiers:
-            if quartier in text_lower:
-                results.append((quartier, 'quartier', 1.0))
-        
-        # Match vocabulary
-        for kabyle, french in self._vocab.items():
-            if kabyle in text_lower:
-                results.append((kabyle, 'vocab', 0.9, french))
+        matched = {}
+        if self._ac is not None:
+            for _, matches in self._ac.iter(text_lower):
+                matched.update(matches)
+        else:
+            for term in self._trigram_candidates(text_lower):
+                if term in text_lower:
+                    matched.update(self._term_payloads[term])
         
-        return tuple(results)
+        return tuple(matched[position] for position in sorted(matched))
     
     def keyword_search(self, text: str) -> List[RAGResult]:
         """
@@ -243,39 +488,11 @@ class HybridRAG:
         """
         text_lower = text.lower()
         
-        # Use cached search with hash keys for cache invalidation
-        cached = self._keyword_search_cached(
-            text_lower, 
-            hash(self._communes), 
-            hash(self._vocab_frozen) if hasattr(self, '_vocab_frozen') else 0
-        )
+        # Use cached search keyed by knowledge version for cache invalidation
+        cached = self._keyword_search_cached(text_lower, self._ac_version)
         
         # Convert cached tuples back to RAGResult objects
-        results = []
-        for item in cached:
-            if item[1] == 'commune':
-                results.append(RAGResult(
-                    text=f"DETECTED_LOCATION: {item[0].title()} (Commune de Bejaia)",
-                    score=item[2],
-                    metadata={"type": "commune", "name": item[0]},
-                    source="keyword"
-                ))
-            elif item[1] == 'quartier':
-                results.append(RAGResult(
-                    text=f"DETECTED_LANDMARK: {item[0].title()} (Quartier connu)",
-                    score=item[2],
-                    metadata={"type": "quartier", "name": item[0]},
-                    source="keyword"
-                ))
-            elif item[1] == 'vocab':
-                results.append(RAGResult(
-                    text=f"DETECTED_VOCAB: {item[0]} -> {item[3]}",
-                    score=item[2],
-                    metadata={"type": "vocab", "kabyle": item[0], "french": item[3]},
-                    source="keyword"
-                ))
-        
-        return results
+        return [_KEYWORD_RESULTS[item[1]](item) for item in cached]
     
     def search(
         self,
@@ -288,35 +505,35 @@ class HybridRAG:
         Returns:
             Tuple of (results list, formatted context string)
         """
-        all_results = []
-        
         # 1. Keyword search (exact matches)
-        keyword_results = self.keyword_search(query)
-        for r in keyword_results:
-            r.score *= self.keyword_weight
-        all_results.extend(keyword_results)
+        kw_weight = self.keyword_weight
+        weighted = [(r.score * kw_weight, r) for r in self.keyword_search(query)]
         
         # 2. Vector search (semantic)
-        if self.vector_store and self.vector_store.collection.count() > 0:
-            vector_results = self.vector_store.query(query, n_results=n_results)
-            for r in vector_results:
-                r.score *= self.vector_weight
-            all_results.extend(vector_results)
-        
-        # Deduplicate and sort by score
-        seen = set()
-        unique_results = []
-        for r in sorted(all_results, key=lambda x: x.score, reverse=True):
-            key = r.text[:50]  # Dedup key
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(r)
+        if self.vector_store:
+            vec_weight = self.vector_weight
+            weighted += [
+                (r.score * vec_weight, r)
+                for r in self.vector_store.query(query, n_results=n_results)
+            ]
+        
+        # Deduplicate (best score per 50-char prefix), then keep the top n;
+        # only the survivors get their weighted score written back
+        best: Dict[str, Tuple[float, RAGResult]] = {}
+        for pair in weighted:
+            key = pair[1].text[:50]  # Dedup key
+            kept = best.get(key)
+            if kept is None or pair[0] > kept[0]:
+                best[key] = pair
+        top = []
+        for score, r in heapq.nlargest(n_results, best.values(), key=itemgetter(0)):
+            r.score = score
+            top.append(r)
         
         # Format context string
-        if not unique_results:
+        if not top:
             context = "NO_CONTEXT_FOUND"
         else:
-            context_lines = [r.text for r in unique_results[:n_results]]
-            context = "\n".join(context_lines)
+            context = "\n".join(r.text for r in top)
         
-        return unique_results[:n_results], context
+        return top, context
@@ -11,12 +11,46 @@ Where:
     - rag_hit_score: Knowledge base match quality (0-1)
 """
 
+import re
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional, Sequence
 from ..schemas.interfaces import EmergencyCall, IncidentType, UrgencyLevel
 
 
-@dataclass
+# Entity of a RAG context line: text after the first ':' up to the next ':' or '('
+_RAG_ENTITY_RE = re.compile(r"^[^:\n]*:([^:(\n]*)", re.MULTILINE)
+
+
+# Common ASR error patterns: trailing/incomplete, inaudible marker, unsure,
+# music/noise hallucination. One case-insensitive pass over the text.
+_ASR_ERROR_RE = re.compile(r"\.\.\.|\[inaudible\]|\?\?\?|musique", re.IGNORECASE)
+
+
+def _mean_confidence(word_confidences: Sequence[float]) -> float:
+    """Average of a non-empty list or NumPy array of word confidences."""
+    # NumPy arrays (e.g. straight from WhisperX) reduce in place; lists use
+    # the builtin C sum, which beats converting them to an array first
+    if hasattr(word_confidences, "mean"):
+        return float(word_confidences.mean())
+    return sum(word_confidences) / len(word_confidences)
+
+
+@dataclass(frozen=True, slots=True)
+class _TranscriptionView:
+    """Derived views of a transcription, computed once per calculate() call."""
+    word_count: int
+    error_hits: int
+    
+    @classmethod
+    def of(cls, transcription: str) -> "_TranscriptionView":
+        return cls(
+            word_count=len(transcription.split()),
+            # Each pattern counts once, however often it repeats
+            error_hits=len({m.lower() for m in _ASR_ERROR_RE.findall(transcription)})
+        )
+
+
+@dataclass(slots=True)
 class ConfidenceResult:
     """Detailed breakdown of confidence calculation."""
     overall: float
@@ -47,6 +81,19 @@ class ConfidenceCalculator:
     # Confidence threshold for human review
     HUMAN_REVIEW_THRESHOLD = 0.70  # per MASTER_VISION.md
     
+    # Review reasoning for every combination of weak components, indexed by a
+    # 3-bit mask (low ASR << 2 | missing entities << 1 | no location)
+    _REVIEW_REASONS = tuple(
+        "HUMAN_REVIEW_REQUIRED: " + (", ".join(
+            reason for bit, reason in zip(
+                (4, 2, 1),
+                ("Low ASR quality", "Missing required entities", "No location verified")
+            ) if mask & bit
+        ) or "Overall confidence below threshold")
+        for mask in range(8)
+    )
+    _ACCEPTED_REASON = "Confidence acceptable for automated dispatch"
+    
     def __init__(
         self,
         asr_weight: float = 0.40,
@@ -73,8 +120,9 @@ class ConfidenceCalculator:
     def calculate_asr_confidence(
         self,
         transcription: str,
-        word_confidences: Optional[List[float]] = None,
-        audio_duration: Optional[float] = None
+        word_confidences: Optional[Sequence[float]] = None,
+        audio_duration: Optional[float] = None,
+        view: Optional[_TranscriptionView] = None
     ) -> float:
         """
         Calculate ASR quality score.
@@ -83,20 +131,23 @@ class ConfidenceCalculator:
         1. Word-level confidence (if available from WhisperX)
         2. Transcription length vs audio duration ratio
         3. Presence of common error patterns
+        
+        `view` reuses a precomputed word-count/error-pattern view of the transcription.
         """
         score = 0.0
         factors = 0
+        if transcription and view is None:
+            view = _TranscriptionView.of(transcription)
         
         # Factor 1: Word-level confidence (if available)
-        if word_confidences and len(word_confidences) > 0:
-            avg_word_conf = sum(word_confidences) / len(word_confidences)
-            score += avg_word_conf
+        if word_confidences is not None and len(word_confidences) > 0:
+            score += _mean_confidence(word_confidences)
             factors += 1
         
         # Factor 2: Transcription quality heuristics
         if transcription:
             # Penalize very short transcriptions
-            word_count = len(transcription.split())
+            word_count = view.word_count
             if word_count < 3:
                 length_score = 0.3
             elif word_count < 10:
@@ -107,14 +158,7 @@ class ConfidenceCalculator:
             factors += 1
             
             # Factor 3: Check for common ASR error patterns
-            error_patterns = [
-                "...",  # Trailing/incomplete
-                "[inaudible]",
-                "???",
-                "musique",  # Music/noise hallucination
-            ]
-            error_count = sum(1 for p in error_patterns if p.lower() in transcription.lower())
-            error_score = max(0.0, 1.0 - (error_count * 0.2))
+            error_score = max(0.0, 1.0 - (view.error_hits * 0.2))
             score += error_score
             factors += 1
         
@@ -122,7 +166,7 @@ class ConfidenceCalculator:
         if audio_duration and transcription:
             # Expected: ~2-3 words per second of speech
             expected_words = audio_duration * 2.5
-            actual_words = len(transcription.split())
+            actual_words = view.word_count
             ratio = actual_words / max(expected_words, 1)
             # Good range: 0.5 - 1.5
             if 0.5 <= ratio <= 1.5:
@@ -217,13 +261,12 @@ class ConfidenceCalculator:
         # Verify extraction used RAG context
         if extracted_location:
             location_details = str(extracted_location.get("details", "")).lower()
-            # Check if any RAG entity appears in extraction
-            for line in rag_context.split("\n"):
-                if ":" in line:
-                    entity = line.split(":")[1].split("(")[0].strip().lower()
-                    if entity in location_details:
-                        score = min(1.0, score + 0.2)
-                        break
+            # Check if any RAG entity appears in extraction (one regex pass)
+            if any(
+                entity.strip().lower() in location_details
+                for entity in _RAG_ENTITY_RE.findall(rag_context)
+            ):
+                score = min(1.0, score + 0.2)
         
         return score
     
@@ -232,7 +275,7 @@ class ConfidenceCalculator:
         transcription: str,
         extracted: Dict[str, Any],
         rag_context: str = "NO_CONTEXT_FOUND",
-        word_confidences: Optional[List[float]] = None,
+        word_confidences: Optional[Sequence[float]] = None,
         audio_duration: Optional[float] = None
     ) -> ConfidenceResult:
         """
@@ -250,7 +293,8 @@ class ConfidenceCalculator:
         """
         # Calculate component scores
         asr_score = self.calculate_asr_confidence(
-            transcription, word_confidences, audio_duration
+            transcription, word_confidences, audio_duration,
+            view=_TranscriptionView.of(transcription) if transcription else None
         )
         
         entity_score = self.calculate_entity_coverage(extracted)
@@ -270,19 +314,12 @@ class ConfidenceCalculator:
         # Determine if human review needed
         triggers_review = overall < self.HUMAN_REVIEW_THRESHOLD
         
-        # Generate reasoning
-        reasoning_parts = []
-        if asr_score < 0.5:
-            reasoning_parts.append("Low ASR quality")
-        if entity_score < 0.5:
-            reasoning_parts.append("Missing required entities")
-        if rag_score == 0:
-            reasoning_parts.append("No location verified")
-        
+        # Generate reasoning (precomputed strings, no per-call joins)
         if triggers_review:
-            reasoning = f"HUMAN_REVIEW_REQUIRED: {', '.join(reasoning_parts) or 'Overall confidence below threshold'}"
+            mask = (asr_score < 0.5) << 2 | (entity_score < 0.5) << 1 | (rag_score == 0)
+            reasoning = self._REVIEW_REASONS[mask]
         else:
-            reasoning = "Confidence acceptable for automated dispatch"
+            reasoning = self._ACCEPTED_REASON
         
         return ConfidenceResult(
             overall=round(overall, 3),
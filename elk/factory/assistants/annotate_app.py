@@ -11,7 +11,7 @@ import pandas as pd
 import google.generativeai as genai
 from datetime import datetime
 from glob import glob
-from pydub import AudioSegment
+import subprocess
 import time
 
 # --- CONFIGURATION INITIALE ---
@@ -42,7 +42,8 @@ st.markdown("""
 DATA_DIR = "data"
 AUDIO_RAW_DIR = "data/raw_audio"
 AUDIO_PROC_DIR = "data/processed_audio"
-ANNOTATIONS_FILE = os.path.join(DATA_DIR, "annotations.json")
+ANNOTATIONS_FILE = os.path.join(DATA_DIR, "annotations.json")  # legacy snapshot, read-only
+ANNOTATIONS_LOG = os.path.join(DATA_DIR, "annotations.jsonl")   # append-only, one line per save
 CONFIG_FILE = "config.json"
 
 for d in [DATA_DIR, AUDIO_RAW_DIR, AUDIO_PROC_DIR]: os.makedirs(d, exist_ok=True)
@@ -53,24 +54,80 @@ def load_data(p):
         with open(p, 'r', encoding='utf-8') as f: return json.load(f)
     return []
 
-def save_all(data_list):
-    with open(ANNOTATIONS_FILE, 'w', encoding='utf-8') as f: 
-        json.dump(data_list, f, ensure_ascii=False, indent=2)
+def load_annotations():
+    """Legacy annotations.json, then the JSONL log replayed on top: last save per file wins."""
+    annotations = load_data(ANNOTATIONS_FILE)
+    index = {a.get('audio_file'): i for i, a in enumerate(annotations)}
+    if os.path.exists(ANNOTATIONS_LOG):
+        with open(ANNOTATIONS_LOG, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from a crash
+                key = entry.get('audio_file')
+                if key in index:
+                    annotations[index[key]] = entry
+                else:
+                    index[key] = len(annotations)
+                    annotations.append(entry)
+    return annotations, index
+
+def append_annotation(entry):
+    """O(1) save: one JSON line appended, the existing annotations are not rewritten."""
+    line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+    with open(ANNOTATIONS_LOG, 'a+b') as f:
+        # A crash mid-write can leave a torn last line without its newline;
+        # terminate it so this entry starts on a line of its own
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+
+@st.cache_data(ttl=30)
+def scan_raw_files():
+    """Annotation queue; rescanned at most every 30 s instead of on every rerun."""
+    return sorted(glob(f"{AUDIO_RAW_DIR}/*.wav") + glob(f"{AUDIO_RAW_DIR}/*.mp3") + glob(f"{AUDIO_RAW_DIR}/*.ogg"))
+
+def annotations_mtime():
+    return tuple(
+        os.stat(p).st_mtime_ns if os.path.exists(p) else 0
+        for p in (ANNOTATIONS_FILE, ANNOTATIONS_LOG)
+    )
+
+def session_annotations():
+    """
+    Annotations list and file -> index map, kept in session state and re-read
+    only when the annotation files changed on disk (e.g. another annotator saved).
+    """
+    mtime = annotations_mtime()
+    if st.session_state.get('ann_mtime') != mtime:
+        st.session_state.annotations, st.session_state.ann_index = load_annotations()
+        st.session_state.ann_mtime = mtime
+    return st.session_state.annotations, st.session_state.ann_index
 
 def process_audio(p):
     try:
         out = os.path.join(AUDIO_PROC_DIR, os.path.basename(p).split('.')[0] + ".wav")
         if not os.path.exists(out):
-            AudioSegment.from_file(p).set_frame_rate(16000).set_channels(1).export(out, format="wav")
+            # One ffmpeg pass: decode, downmix, resample, encode (no PCM through Python).
+            # Written beside the target then renamed, so a failed run leaves no stub.
+            tmp = out + ".part"
+            subprocess.run(
+                ["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", p,
+                 "-ac", "1", "-ar", "16000", "-f", "wav", tmp],
+                check=True, capture_output=True
+            )
+            os.replace(tmp, out)
         return out
     except Exception as e:
         print(f"Audio error: {e}")
         return None
 
 # --- APP LOGIC ---
-annotations = load_data(ANNOTATIONS_FILE)
-ann_map = { a.get('audio_file'): a for a in annotations }
-raw_files = sorted(glob(f"{AUDIO_RAW_DIR}/*.wav") + glob(f"{AUDIO_RAW_DIR}/*.mp3") + glob(f"{AUDIO_RAW_DIR}/*.ogg"))
+annotations, ann_index = session_annotations()
+raw_files = scan_raw_files()
 
 if not raw_files:
     st.warning(f"No audio files found in {AUDIO_RAW_DIR}. Please add calls to annotate.")
@@ -79,7 +136,8 @@ if not raw_files:
 if 'idx' not in st.session_state: st.session_state.idx = 0
 cur_path = raw_files[st.session_state.idx]
 cur_f = os.path.basename(cur_path)
-is_done = cur_f in ann_map
+is_done = cur_f in ann_index
+current = annotations[ann_index[cur_f]] if is_done else {}
 
 # Sidebar
 with st.sidebar:
@@ -96,13 +154,13 @@ if wav:
     st.audio(wav)
 
 # Transcription Area
-default_text = ann_map[cur_f].get('transcription', "") if is_done else ""
+default_text = current.get('transcription', "")
 transcription = st.text_area("Transcription Log", value=default_text, height=150)
 
 # Attributes
 c1, c2 = st.columns(2)
-incident = c1.text_input("Incident Type", value=ann_map[cur_f].get('incident', "") if is_done else "")
-location = c2.text_input("Location", value=ann_map[cur_f].get('location', "") if is_done else "")
+incident = c1.text_input("Incident Type", value=current.get('incident', ""))
+location = c2.text_input("Location", value=current.get('location', ""))
 
 if st.button("SAVE ANNOTATION", type="primary"):
     entry = {
@@ -113,17 +171,15 @@ if st.button("SAVE ANNOTATION", type="primary"):
         "timestamp": datetime.now().isoformat()
     }
     
-    # Update or Append
-    found = False
-    for i, a in enumerate(annotations):
-        if a['audio_file'] == cur_f:
-            annotations[i] = entry
-            found = True
-            break
-    if not found:
+    # Update or Append (in place: the session copy stays current)
+    if is_done:
+        annotations[ann_index[cur_f]] = entry
+    else:
+        ann_index[cur_f] = len(annotations)
         annotations.append(entry)
         
-    save_all(annotations)
+    append_annotation(entry)
+    st.session_state.ann_mtime = annotations_mtime()
     st.success("Saved!")
     time.sleep(1)
     st.session_state.idx = (st.session_state.idx + 1) % len(raw_files)
@@ -4,9 +4,85 @@ Loads and validates pack configuration from YAML files.
 """
 
 import os
-from typing import Dict, Any, Optional
+import re
+import json
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+# Use orjson for faster cache reads (with fallback)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+def load_yaml_cached(path: Path) -> Any:
+    """
+    Parse a YAML file through a JSON sidecar cache (<file>.cache.json).
+    The sidecar records the source file's mtime and size and is reused only
+    while both match exactly, so boots after the first skip PyYAML entirely
+    and a replaced file (even one with an older mtime) is always re-parsed.
+    """
+    cache_path = path.with_name(path.name + ".cache.json")
+    stat = path.stat()
+    source = [stat.st_mtime_ns, stat.st_size]
+    try:
+        cached = json_loads(cache_path.read_bytes())
+        if isinstance(cached, dict) and cached.get("source") == source:
+            return cached["data"]
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    from elk.core import yaml_io
+    data = yaml_io.load(path)
+    
+    try:
+        blob = json.dumps({"source": source, "data": data}, ensure_ascii=False).encode('utf-8')
+        # Only cache documents that survive JSON unchanged (no dates, non-str keys...)
+        if json_loads(blob)["data"] == data:
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(blob)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Read-only pack directory or non-JSON types: just skip the cache
+        pass
+    return data
+
+
+# ${VAR} or ${VAR:-default}
+_ENV_RE = re.compile(r"\$\{([^:}]+)(?::-([^}]*))?\}")
+
+
+def _env_value(match: "re.Match[str]") -> str:
+    value = os.getenv(match.group(1))
+    if value is not None:
+        return value
+    # Unset without a default: leave the placeholder as written
+    return match.group(2) if match.group(2) is not None else match.group(0)
+
+
+# Files a pack config is built from (their mtimes key the load_pack_config cache)
+PACK_FILES = ("config.yaml", "rules.yaml", "geography.json")
+
+
+def _flatten(obj: Dict[str, Any], prefix: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Map every dot-notation path of a nested dict to its value, intermediate
+    dicts included ({"a": {"b": 1}} -> {"a": {...}, "a.b": 1}). Keys that
+    contain a dot are skipped: a dotted lookup could never reach them.
+    """
+    if out is None:
+        out = {}
+    for key, value in obj.items():
+        if not isinstance(key, str) or "." in key:
+            continue
+        path = prefix + key
+        out[path] = value
+        if isinstance(value, dict):
+            _flatten(value, path + ".", out)
+    return out
+
 
 class PackConfig:
     """
@@ -19,54 +95,57 @@ class PackConfig:
     """
     
     def __init__(self, pack_path: str):
-        import yaml
-        import json
-        
         self.pack_path = Path(pack_path)
         
         # Load config.yaml
         config_file = self.pack_path / "config.yaml"
         if config_file.exists():
-            with open(config_file, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f)
+            self._config = load_yaml_cached(config_file)
         else:
             self._config = {}
         
         # Load rules.yaml
         rules_file = self.pack_path / "rules.yaml"
         if rules_file.exists():
-            with open(rules_file, 'r', encoding='utf-8') as f:
-                self._rules = yaml.safe_load(f)
+            self._rules = load_yaml_cached(rules_file)
         else:
             self._rules = {}
         
         # Load geography.json
         geo_file = self.pack_path / "geography.json"
         if geo_file.exists():
-            with open(geo_file, 'r', encoding='utf-8') as f:
-                self._geography = json.load(f)
+            self._geography = json_loads(geo_file.read_bytes())
         else:
             self._geography = {}
         
+        # Feature names partitioned by type, in one pass over the GeoJSON
+        self._names_by_type: Dict[Any, list] = {}
+        for feature in self._geography.get("features", []):
+            props = feature.get("properties", {})
+            self._names_by_type.setdefault(props.get("type"), []).append(props.get("name"))
+        
         # Expand environment variables
         self._expand_env_vars(self._config)
+        
+        # Dot-notation index for get()
+        self._flat = _flatten(self._config)
     
     def _expand_env_vars(self, obj: Any) -> Any:
-        """Recursively expand environment variables in config values."""
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                obj[key] = self._expand_env_vars(value)
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                obj[i] = self._expand_env_vars(item)
-        elif isinstance(obj, str) and obj.startswith("${") and "}" in obj:
-            # Parse ${VAR:-default} syntax
-            var_expr = obj[2:-1]  # Remove ${ and }
-            if ":-" in var_expr:
-                var_name, default = var_expr.split(":-", 1)
-                return os.getenv(var_name, default)
-            else:
-                return os.getenv(var_expr, obj)
+        """Expand ${VAR} / ${VAR:-default} in every config string (in place)."""
+        if isinstance(obj, str):
+            return _ENV_RE.sub(_env_value, obj) if "${" in obj else obj
+        
+        # Explicit stack instead of one recursive call per node
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    if "${" in value:
+                        node[key] = _ENV_RE.sub(_env_value, value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
         return obj
     
     @property
@@ -79,13 +158,7 @@ class PackConfig:
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get config value by dot-notation key (e.g., 'llm.provider')."""
-        keys = key.split(".")
-        value = self._config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return default
+        value = self._flat.get(key)
         return value if value is not None else default
     
     def get_llm_config(self) -> Dict[str, Any]:
@@ -130,27 +203,33 @@ class PackConfig:
     
     def get_communes(self) -> list:
         """Extract commune names from geography."""
-        communes = []
-        for feature in self._geography.get("features", []):
-            props = feature.get("properties", {})
-            if props.get("type") == "commune":
-                communes.append(props.get("name"))
-        return communes
+        return list(self._names_by_type.get("commune", ()))
     
     def get_landmarks(self) -> list:
         """Extract landmark names from geography."""
-        landmarks = []
-        for feature in self._geography.get("features", []):
-            props = feature.get("properties", {})
-            if props.get("type") == "landmark":
-                landmarks.append(props.get("name"))
-        return landmarks
+        return list(self._names_by_type.get("landmark", ()))
+
+
+_pack_cache: Dict[Path, Tuple[Tuple[Optional[int], ...], PackConfig]] = {}
+
+
+def _pack_signature(pack_path: Path) -> Tuple[Optional[int], ...]:
+    signature = []
+    for name in PACK_FILES:
+        try:
+            signature.append((pack_path / name).stat().st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
 
 
 def load_pack_config(pack_name: str) -> PackConfig:
     """
     Load pack configuration by name.
     Searches in the packs/ directory.
+    
+    Configs are cached per pack directory and reloaded when one of the pack
+    files changes. Environment variables are expanded when a config is loaded.
     """
     # Convert hyphen to underscore for Python module compatibility
     module_name = pack_name.replace("-", "_")
@@ -170,4 +249,11 @@ def load_pack_config(pack_name: str) -> PackConfig:
     if not pack_path.exists():
         raise FileNotFoundError(f"Pack not found: {pack_name} at {pack_path}")
     
-    return PackConfig(pack_path)
+    signature = _pack_signature(pack_path)
+    cached = _pack_cache.get(pack_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    config = PackConfig(pack_path)
+    _pack_cache[pack_path] = (signature, config)
+    return config
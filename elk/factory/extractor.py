@@ -12,8 +12,9 @@ Workflow:
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 from dataclasses import dataclass, field
 
 
@@ -63,11 +64,12 @@ class PDFChunker:
         doc = fitz.open(pdf_path)
         
         for page_num, page in enumerate(doc):
-            text = page.get_text()
-            
-            # Split into chunks with overlap
-            page_chunks = self._chunk_text(text, page_num)
-            chunks.extend(page_chunks)
+            # Paragraph blocks: (x0, y0, x1, y1, text, block_no, block_type)
+            blocks = page.get_text("blocks")
+            chunks.extend(self._chunk_blocks(
+                (block[4] for block in blocks if block[6] == 0),
+                page_num
+            ))
         
         doc.close()
         
@@ -75,41 +77,47 @@ class PDFChunker:
         return chunks
     
     def _chunk_text(self, text: str, page_num: int) -> List[ExtractedChunk]:
-        """Split text into overlapping chunks."""
+        """Split plain text into overlapping chunks at paragraph breaks."""
+        return self._chunk_blocks(text.split('\n\n'), page_num)
+    
+    def _chunk_blocks(self, blocks: Iterable[str], page_num: int) -> List[ExtractedChunk]:
+        """
+        Accumulate paragraph blocks into overlapping chunks in one pass.
+        
+        A chunk is emitted before the next block would push it past chunk_size;
+        the next chunk starts with its last chunk_overlap characters. Blocks
+        longer than a chunk are cut at chunk_size.
+        """
         chunks = []
+        step = max(self.chunk_size - self.chunk_overlap, 1)
+        buffer = ""
+        pending = False  # buffer holds text that has not been emitted yet
         
-        if len(text) <= self.chunk_size:
+        def emit(text: str) -> None:
             chunks.append(ExtractedChunk(
                 text=text.strip(),
                 page_number=page_num + 1,
-                chunk_index=0
+                chunk_index=len(chunks)
             ))
-            return chunks
         
-        start = 0
-        chunk_idx = 0
-        
-        while start < len(text):
-            end = start + self.chunk_size
+        for block in blocks:
+            block = block.strip()
+            if not block:
+                continue
             
-            # Find paragraph boundary if possible
-            if end < len(text):
-                paragraph_end = text.rfind('\n\n', start, end)
-                if paragraph_end > start:
-                    end = paragraph_end
+            if pending and len(buffer) + 2 + len(block) > self.chunk_size:
+                emit(buffer)
+                buffer = buffer[-self.chunk_overlap:] if self.chunk_overlap > 0 else ""
             
-            chunk_text = text[start:end].strip()
-            if chunk_text:
-                chunks.append(ExtractedChunk(
-                    text=chunk_text,
-                    page_number=page_num + 1,
-                    chunk_index=chunk_idx
-                ))
-                chunk_idx += 1
+            buffer = f"{buffer}\n\n{block}" if buffer else block
+            pending = True
             
-            start = end - self.chunk_overlap
-            if start < 0:
-                start = end
+            while len(buffer) > self.chunk_size:
+                emit(buffer[:self.chunk_size])
+                buffer = buffer[step:]
+        
+        if pending:
+            emit(buffer)
         
         return chunks
 
@@ -124,13 +132,13 @@ class KnowledgeExtractor:
 Analyze the following text from a procedures manual and extract:
 
 1. **VOCABULARY**: Local terms and their standard equivalents
-   Format: {"local_term": "standard_term"}
+   Format: {{"local_term": "standard_term"}}
 
 2. **ENTITIES**: Named entities (locations, equipment, procedures)
-   Format: [{"term": "...", "type": "location|equipment|procedure|personnel"}]
+   Format: [{{"term": "...", "type": "location|equipment|procedure|personnel"}}]
 
 3. **RULES**: Business rules or dispatch logic
-   Format: [{"condition": "IF ...", "action": "THEN ...", "priority": "HIGH|MEDIUM|LOW"}]
+   Format: [{{"condition": "IF ...", "action": "THEN ...", "priority": "HIGH|MEDIUM|LOW"}}]
 
 TEXT TO ANALYZE:
 ---
@@ -145,7 +153,22 @@ Respond with valid JSON only:
 }}
 """
     
-    def __init__(self, llm_client=None):
+    def __init__(
+        self,
+        llm_client=None,
+        max_workers: int = 16,
+        batch_size: int = 8,
+        batch_chars: int = 24000
+    ):
+        # Chunk calls are network-bound, so they run on a thread pool
+        self.max_workers = max(1, max_workers)
+        # Chunks packed per LLM call, capped by prompt size (~6k tokens)
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        # Render the template once; each chunk is then a plain concatenation
+        self._prompt_head, self._prompt_tail = self.EXTRACTION_PROMPT.format(
+            chunk_text="\0"
+        ).split("\0", 1)
         if llm_client is None:
             from elk.kernel.ai.llm import LLMClient
             self.llm = LLMClient()
@@ -154,21 +177,62 @@ Respond with valid JSON only:
     
     def extract_from_chunk(self, chunk: ExtractedChunk) -> Dict[str, Any]:
         """Extract knowledge from a single chunk."""
-        prompt = self.EXTRACTION_PROMPT.format(chunk_text=chunk.text)
-        
         try:
-            result = self.llm.extract_json(prompt)
-            return {
-                'vocabulary': result.get('vocabulary', {}),
-                'entities': result.get('entities', []),
-                'rules': result.get('rules', []),
-                'page': chunk.page_number,
-                'chunk': chunk.chunk_index
-            }
+            return self._chunk_result(chunk, self.llm.extract_json(self._prompt(chunk)))
         except Exception as e:
             logger.warning(f"Extraction failed for chunk {chunk.chunk_index}: {e}")
             return {'vocabulary': {}, 'entities': [], 'rules': []}
     
+    def _prompt(self, chunk: ExtractedChunk) -> str:
+        return f"{self._prompt_head}{chunk.text}{self._prompt_tail}"
+    
+    @staticmethod
+    def _chunk_result(chunk: ExtractedChunk, result: Any) -> Dict[str, Any]:
+        if not isinstance(result, dict):
+            logger.warning(f"Extraction returned no object for chunk {chunk.chunk_index}")
+            return {'vocabulary': {}, 'entities': [], 'rules': []}
+        return {
+            'vocabulary': result.get('vocabulary', {}),
+            'entities': result.get('entities', []),
+            'rules': result.get('rules', []),
+            'page': chunk.page_number,
+            'chunk': chunk.chunk_index
+        }
+    
+    def extract_from_chunks(self, chunks: List[ExtractedChunk]) -> List[Dict[str, Any]]:
+        """
+        Extract knowledge from many chunks, in chunk order.
+        
+        Several chunks share one LLM call (LLMClient.generate_batch) when the
+        client supports it; only the chunks whose answer failed (None) are then
+        retried on their own.
+        """
+        if not chunks:
+            return []
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+        if hasattr(self.llm, 'generate_batch') and self.batch_size > 1:
+            # Failed rows come back as None; configuration errors propagate
+            answers = self.llm.generate_batch(
+                [self._prompt(c) for c in chunks],
+                marshal_size=self.batch_size,
+                max_workers=self.max_workers,
+                max_chars=self.batch_chars
+            )
+            for i, (chunk, answer) in enumerate(zip(chunks, answers)):
+                if answer is not None:
+                    results[i] = self._chunk_result(chunk, answer)
+        
+        retry = [i for i, result in enumerate(results) if result is None]
+        if retry:
+            if len(retry) < len(chunks):
+                logger.warning(f"Retrying {len(retry)} failed chunks one by one")
+            workers = min(self.max_workers, len(retry))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, result in zip(retry, pool.map(self.extract_from_chunk, [chunks[i] for i in retry])):
+                    results[i] = result
+        return results
+    
     def extract_from_pdf(
         self,
         pdf_path: str,
@@ -186,10 +250,9 @@ Respond with valid JSON only:
         all_entities = []
         all_rules = []
         
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-            result = self.extract_from_chunk(chunk)
-            
+        # Results come back in chunk order, so later chunks still win on vocab
+        logger.info(f"Processing {len(chunks)} chunks")
+        for result in self.extract_from_chunks(chunks):
             all_vocab.update(result.get('vocabulary', {}))
             all_entities.extend(result.get('entities', []))
             all_rules.extend(result.get('rules', []))
@@ -213,30 +276,24 @@ Respond with valid JSON only:
         return result
     
     def _deduplicate_entities(self, entities: List[Dict]) -> List[Dict]:
-        """Remove duplicate entities."""
-        seen = set()
-        unique = []
-        for e in entities:
-            key = (e.get('term', '').lower(), e.get('type', ''))
-            if key not in seen:
-                seen.add(key)
-                unique.append(e)
-        return unique
+        """Remove duplicate entities (first occurrence wins)."""
+        keys = [(e.get('term', '').lower(), e.get('type', '')) for e in entities]
+        return self._first_of_each(entities, keys)
     
     def _deduplicate_rules(self, rules: List[Dict]) -> List[Dict]:
-        """Remove duplicate rules."""
-        seen = set()
-        unique = []
-        for r in rules:
-            key = (r.get('condition', ''), r.get('action', ''))
-            if key not in seen:
-                seen.add(key)
-                unique.append(r)
-        return unique
+        """Remove duplicate rules (first occurrence wins)."""
+        keys = [(r.get('condition', ''), r.get('action', '')) for r in rules]
+        return self._first_of_each(rules, keys)
+    
+    @staticmethod
+    def _first_of_each(items: List[Dict], keys: List[tuple]) -> List[Dict]:
+        # setdefault keeps the first index per key, in one C-level dict probe
+        first: Dict[tuple, int] = {}
+        return [item for i, (item, key) in enumerate(zip(items, keys)) if first.setdefault(key, i) == i]
     
     def _save_results(self, result: ExtractionResult, output_dir: str):
         """Save extraction results as YAML candidates."""
-        import yaml
+        from elk.core import yaml_io
         
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
@@ -244,21 +301,21 @@ Respond with valid JSON only:
         # Save vocabulary as lexicon_candidate.yaml
         lexicon_path = output_path / "lexicon_candidate.yaml"
         with open(lexicon_path, 'w', encoding='utf-8') as f:
-            yaml.dump({
+            yaml_io.dump({
                 'vocabulary': result.vocabulary,
                 'source': result.source_file,
                 'status': 'CANDIDATE_NEEDS_REVIEW'
-            }, f, allow_unicode=True, default_flow_style=False)
+            }, f)
         
         # Save rules as rules_candidate.yaml
         rules_path = output_path / "rules_candidate.yaml"
         with open(rules_path, 'w', encoding='utf-8') as f:
-            yaml.dump({
+            yaml_io.dump({
                 'entities': result.entities,
                 'rules': result.rules,
                 'source': result.source_file,
                 'status': 'CANDIDATE_NEEDS_REVIEW'
-            }, f, allow_unicode=True, default_flow_style=False)
+            }, f)
         
         logger.info(f"Saved candidates to: {output_dir}")
         logger.info(f"  - {lexicon_path.name}: {len(result.vocabulary)} terms")
@@ -9,10 +9,29 @@ import json
 import hashlib
 import sqlite3
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+# Use orjson for faster JSONL parsing (with fallback)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream records from a JSONL file, one line in memory at a time."""
+    with open(path, 'rb') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json_loads(line)
+            except ValueError as e:
+                print(f"Skipping invalid line {lineno}: {e}")
+
 
 @dataclass
 class TrainingSample:
@@ -79,31 +98,75 @@ class TrainingDatabase:
         with open(audio_path, 'rb') as f:
             return hashlib.sha256(f.read()).hexdigest()[:16]
     
+    INSERT_SAMPLE = """
+        INSERT OR REPLACE INTO samples 
+        (audio_hash, audio_path, transcription_raw, transcription_golden,
+         dialect_tags, is_test_set, quality_score, created_at, validated_by)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    IMPORT_BATCH_SIZE = 1000
+    
+    @staticmethod
+    def _sample_params(sample: TrainingSample) -> tuple:
+        return (
+            sample.audio_hash,
+            sample.audio_path,
+            sample.transcription_raw,
+            sample.transcription_golden,
+            json.dumps(sample.dialect_tags),
+            1 if sample.is_test_set else 0,
+            sample.quality_score,
+            sample.created_at or datetime.now().isoformat(),
+            sample.validated_by
+        )
+    
     def add_sample(self, sample: TrainingSample) -> bool:
         """Add or update a training sample."""
         try:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO samples 
-                (audio_hash, audio_path, transcription_raw, transcription_golden,
-                 dialect_tags, is_test_set, quality_score, created_at, validated_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                sample.audio_hash,
-                sample.audio_path,
-                sample.transcription_raw,
-                sample.transcription_golden,
-                json.dumps(sample.dialect_tags),
-                1 if sample.is_test_set else 0,
-                sample.quality_score,
-                sample.created_at or datetime.now().isoformat(),
-                sample.validated_by
-            ))
+            self.conn.execute(self.INSERT_SAMPLE, self._sample_params(sample))
             self.conn.commit()
             return True
         except Exception as e:
             print(f"Error adding sample: {e}")
             return False
     
+    def add_samples(self, samples: Iterable[TrainingSample]) -> int:
+        """
+        Add or update samples from any iterable, committing every IMPORT_BATCH_SIZE rows.
+        Only one batch is held in memory, so generators of any length are fine.
+        """
+        added = 0
+        batch: List[tuple] = []
+        for sample in samples:
+            batch.append(self._sample_params(sample))
+            if len(batch) >= self.IMPORT_BATCH_SIZE:
+                added += self._insert_batch(batch)
+                batch = []
+        if batch:
+            added += self._insert_batch(batch)
+        return added
+    
+    def _insert_batch(self, batch: List[tuple]) -> int:
+        try:
+            with self.conn:
+                self.conn.executemany(self.INSERT_SAMPLE, batch)
+            return len(batch)
+        except sqlite3.Error as e:
+            print(f"Error adding batch of {len(batch)} samples ({e}), retrying row by row")
+        
+        # One bad row rolls back the whole executemany: replay the batch so only
+        # failing rows are skipped (a failed statement doesn't abort the transaction)
+        added = 0
+        with self.conn:
+            for params in batch:
+                try:
+                    self.conn.execute(self.INSERT_SAMPLE, params)
+                    added += 1
+                except sqlite3.Error as e:
+                    print(f"Error adding sample {params[1]}: {e}")
+        return added
+    
     def get_training_set(
         self,
         min_quality: float = 0.5,
@@ -143,28 +206,28 @@ class TrainingDatabase:
         )
     
     def import_from_jsonl(self, jsonl_path: str) -> int:
-        """Import samples from JSONL file (from elk annotate)."""
-        imported = 0
-        with open(jsonl_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    data = json.loads(line)
-                    sample = TrainingSample(
-                        audio_hash=data.get('audio_hash') or self.compute_audio_hash(data['audio_path']),
-                        audio_path=data['audio_path'],
-                        transcription_raw=data.get('transcription_raw', ''),
-                        transcription_golden=data['transcription'],
-                        dialect_tags=data.get('dialect_tags', []),
-                        is_test_set=data.get('is_test_set', False),
-                        quality_score=data.get('quality_score', 1.0),
-                        validated_by=data.get('validated_by', 'unknown')
-                    )
-                    if self.add_sample(sample):
-                        imported += 1
-                except Exception as e:
-                    print(f"Skipping invalid line: {e}")
-        
-        return imported
+        """
+        Import samples from JSONL file (from elk annotate).
+        Streams the file line by line and inserts in batches, so multi-GB
+        datasets import with flat memory.
+        """
+        return self.add_samples(self._iter_samples(iter_jsonl(jsonl_path)))
+    
+    def _iter_samples(self, records: Iterable[Dict[str, Any]]) -> Iterator[TrainingSample]:
+        for data in records:
+            try:
+                yield TrainingSample(
+                    audio_hash=data.get('audio_hash') or self.compute_audio_hash(data['audio_path']),
+                    audio_path=data['audio_path'],
+                    transcription_raw=data.get('transcription_raw', ''),
+                    transcription_golden=data['transcription'],
+                    dialect_tags=data.get('dialect_tags', []),
+                    is_test_set=data.get('is_test_set', False),
+                    quality_score=data.get('quality_score', 1.0),
+                    validated_by=data.get('validated_by', 'unknown')
+                )
+            except Exception as e:
+                print(f"Skipping invalid line: {e}")
     
     def export_for_training(
         self,
@@ -9,13 +9,12 @@ import os
 import asyncio
 import logging
 import traceback
-from datetime import datetime
 from typing import Dict, Any
 
 from arq import Worker
 from arq.connections import RedisSettings
 
-from elk.database.db import get_session, async_engine, init_db
+from elk.database.db import AsyncSessionLocal, init_db
 from elk.database.models import Job, JobStatus
 from elk.factory.loader import load_pipeline
 from elk.engine.models import get_model_registry
@@ -38,6 +37,9 @@ async def startup(ctx):
     # Initialize DB tables if needed
     await init_db()
     
+    # One connector for every job this worker runs
+    ctx["connector"] = ConnectorFactory.get_connector()
+    
     # Warm up models (Singleton)
     # This ensures the first job doesn't suffer latency
     registry = get_model_registry()
@@ -53,6 +55,7 @@ async def startup(ctx):
 async def shutdown(ctx):
     """Worker shutdown: Cleanup."""
     logger.info("Worker shutting down...")
+    await ConnectorFactory.close()
     get_model_registry().unload_all()
 
 async def process_audio_job(ctx, job_id: str, pack_name: str, audio_path: str, meta: Dict[str, Any]):
@@ -64,15 +67,8 @@ async def process_audio_job(ctx, job_id: str, pack_name: str, audio_path: str, m
     log_prefix = f"[{correlation_id}] " if correlation_id else ""
     logger.info(f"{log_prefix}Processing Job {job_id} [{pack_name}]")
     
-    # Create DB Session
-    # Note: Arq ctx["session_maker"] relies on startup context, 
-    # but here we use our global get_session dependency pattern manually
-    from sqlalchemy.orm import sessionmaker
-    from sqlalchemy.ext.asyncio import AsyncSession
-    
-    async_session = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with async_session() as session:
+    # Create DB Session (shared module-level factory, same as the API)
+    async with AsyncSessionLocal() as session:
         # 1. Update State -> PROCESSING
         db_job = await session.get(Job, job_id)
         if not db_job:
@@ -80,7 +76,6 @@ async def process_audio_job(ctx, job_id: str, pack_name: str, audio_path: str, m
             return
         
         db_job.status = JobStatus.PROCESSING
-        db_job.updated_at = datetime.utcnow()
         await session.commit()
         
         try:
@@ -112,13 +107,12 @@ async def process_audio_job(ctx, job_id: str, pack_name: str, audio_path: str, m
             db_job.status = final_status
             db_job.result_data = result.model_dump() # EmergencyCall is Pydantic
             db_job.processing_time = duration
-            db_job.updated_at = datetime.utcnow()
             
             await session.commit()
             logger.info(f"{log_prefix}Job {job_id} COMPLETED in {duration:.2f}s")
 
             # 4. Push to Connector (with timeout + retries)
-            connector = ConnectorFactory.get_connector()
+            connector = ctx.get("connector") or ConnectorFactory.get_connector()
             payload = {
                 "job_id": job_id,
                 "pack": pack_name,
@@ -127,20 +121,32 @@ async def process_audio_job(ctx, job_id: str, pack_name: str, audio_path: str, m
                 "correlation_id": correlation_id
             }
 
-            for attempt in range(1, settings.CONNECTOR_MAX_RETRIES + 1):
+            # Connectors that retry internally get one call and bound their own
+            # attempts; wrapping them would multiply POSTs and cut off hedges
+            internal = getattr(connector, "retries_internally", False)
+            max_attempts = 1 if internal else settings.CONNECTOR_MAX_RETRIES
+            push_timeout = None if internal else settings.CONNECTOR_TIMEOUT
+            
+            for attempt in range(1, max_attempts + 1):
                 try:
-                    await asyncio.wait_for(
+                    pushed = await asyncio.wait_for(
                         connector.push_incident(payload),
-                        timeout=settings.CONNECTOR_TIMEOUT
+                        timeout=push_timeout
                     )
-                    break
                 except Exception as e:
+                    # Raised errors (timeouts, network) are transient: back off and retry
                     logger.error(
-                        f"{log_prefix}Connector push failed (attempt {attempt}/{settings.CONNECTOR_MAX_RETRIES}): {e}"
+                        f"{log_prefix}Connector push failed (attempt {attempt}/{max_attempts}): {e}"
                     )
-                    if attempt >= settings.CONNECTOR_MAX_RETRIES:
+                    if attempt >= max_attempts:
                         break
                     await asyncio.sleep(settings.CONNECTOR_RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+                    continue
+                
+                # False is a definitive refusal (e.g. no URL configured): retrying can't help
+                if not pushed:
+                    logger.warning(f"{log_prefix}Connector did not accept job {job_id}, not retrying")
+                break
         except Exception as e:
             logger.error(f"{log_prefix}Job {job_id} FAILED: {e}")
             trace = traceback.format_exc()
@@ -148,7 +154,6 @@ async def process_audio_job(ctx, job_id: str, pack_name: str, audio_path: str, m
             db_job.status = JobStatus.FAILED
             db_job.error_message = str(e)
             db_job.traceback = trace
-            db_job.updated_at = datetime.utcnow()
             await session.commit()
             
             # Re-raise to let Arq handle retries? 
@@ -0,0 +1,141 @@
+import json
+from datetime import datetime
+
+from elk.engine.analytics import AuditLogger, CallAnalytics, CallRecord
+
+
+def _write_calls(log_dir, records):
+    today = datetime.now().strftime("%Y-%m-%d")
+    path = log_dir / f"calls_{today}.jsonl"
+    lines = [json.dumps(r) for r in records] + ["{not json"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_load_from_logs_aggregates_history(tmp_path):
+    """Historical logs feed the same counters and averages as live calls."""
+    _write_calls(tmp_path, [
+        {"incident_type": "fire_forest", "urgency": "high", "location": {"commune": "Akbou"},
+         "confidence": 0.9, "needs_human_review": False, "processing_time_ms": 100},
+        {"incident_type": "fire_forest", "urgency": "critical", "location": {"commune": "Akbou"},
+         "confidence": 0.5, "needs_human_review": True, "processing_time_ms": 300},
+        {"incident_type": "drowning", "urgency": "high", "location": None,
+         "confidence": 0.7, "needs_human_review": False, "processing_time_ms": 200},
+    ])
+    analytics = CallAnalytics(log_dir=str(tmp_path))
+    analytics.record_call("drowning", "low", "Bejaia", 0.3, True, 400)
+
+    analytics.load_from_logs(days=1)
+
+    stats = analytics.get_stats()
+    assert stats["total_calls"] == 4
+    assert stats["by_incident_type"] == {"fire_forest": 2, "drowning": 2}
+    assert stats["by_commune"] == {"Akbou": 2, "Bejaia": 1}
+    assert stats["human_review_count"] == 2
+
+    kpis = analytics.get_kpis()
+    assert kpis["avg_confidence"] == 0.6
+    assert kpis["avg_response_time_ms"] == 250.0
+    assert kpis["top_commune"] == "Akbou"
+
+
+def test_top_kpis_follow_live_calls(tmp_path):
+    """The cached leader is overtaken as soon as another key passes it."""
+    analytics = CallAnalytics(log_dir=str(tmp_path))
+    assert analytics.get_kpis()["top_incident_type"] == "NONE"
+
+    analytics.record_call("fire_forest", "high", "Akbou", 0.9, False, 100)
+    assert analytics.get_kpis()["top_incident_type"] == "fire_forest"
+
+    analytics.record_call("drowning", "high", "Bejaia", 0.9, False, 100)
+    analytics.record_call("drowning", "high", "Bejaia", 0.9, False, 100)
+    kpis = analytics.get_kpis()
+    assert kpis["top_incident_type"] == "drowning"
+    assert kpis["top_commune"] == "Bejaia"
+
+
+def test_audit_logger_round_trips_records(tmp_path):
+    """Audit lines written from a CallRecord load back into CallAnalytics."""
+    logger = AuditLogger(log_dir=str(tmp_path))
+    logger.log(CallRecord(
+        call_id="c1", timestamp="2026-01-01T00:00:00", audio_file="a.wav", pack="dz-kab-protection",
+        transcription_raw="tmes", transcription_normalized="tmes", incident_type="fire_building",
+        urgency="high", location={"commune": "Tizi Ouzou"}, confidence=0.8, asr_confidence=None,
+        entity_confidence=None, rag_confidence=None, needs_human_review=False,
+        human_review_reason=None, processing_time_ms=120, llm_provider="mock", asr_model="mock",
+    ))
+    logger.flush()
+
+    record = json.loads(logger.log_file.read_text(encoding="utf-8"))
+    assert record["location"] == {"commune": "Tizi Ouzou"}
+    assert record["dispatch_units"] is None
+
+    analytics = CallAnalytics(log_dir=str(tmp_path))
+    analytics.load_from_logs(days=1)
+    assert analytics.get_stats()["by_commune"] == {"Tizi Ouzou": 1}
+
+
+def test_audit_logger_log_dict_accepts_non_str_keys(tmp_path):
+    """log_dict keeps stdlib json's int-key behaviour under orjson."""
+    logger = AuditLogger(log_dir=str(tmp_path))
+    with logger:
+        logger.log_dict({"units": {1: "ambulance"}, "at": datetime(2026, 1, 1)})
+
+    record = json.loads(logger.log_file.read_text(encoding="utf-8"))
+    assert record["units"] == {"1": "ambulance"}
+    assert "logged_at" in record
+
+
+def test_audit_loggers_sharing_a_day_file_append_whole_lines(tmp_path):
+    """Two writers (e.g. two server workers) interleave records without tearing lines."""
+    first, second = AuditLogger(log_dir=str(tmp_path)), AuditLogger(log_dir=str(tmp_path))
+    first.BUFFER_SIZE = second.BUFFER_SIZE = 64
+    for i in range(50):
+        (first if i % 2 else second).log_dict({"n": i, "pad": "x" * 40})
+    first.close()
+    second.close()
+
+    lines = first.log_file.read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["n"] for line in lines) == list(range(50))
+
+
+def test_audit_logger_writes_call_records_through_and_ages_out_buffered_dicts(tmp_path, monkeypatch):
+    """Call records hit the file at once; log_dict entries wait at most FLUSH_INTERVAL."""
+    clock = [1000.0]
+    monkeypatch.setattr("elk.engine.analytics.time.time", lambda: clock[0])
+    logger = AuditLogger(log_dir=str(tmp_path))
+    logger._rotate_at = float("inf")
+
+    logger.log_dict({"n": 1})
+    assert logger.log_file.read_text(encoding="utf-8") == ""
+
+    clock[0] += logger.FLUSH_INTERVAL
+    logger.log_dict({"n": 2})
+    assert [json.loads(line)["n"] for line in logger.log_file.read_text(encoding="utf-8").splitlines()] == [1, 2]
+
+    logger.log(CallRecord(
+        call_id="c1", timestamp="2026-01-01T00:00:00", audio_file="a.wav", pack="dz-kab-protection",
+        transcription_raw="", transcription_normalized="", incident_type="fire_building",
+        urgency="high", location={}, confidence=0.8, asr_confidence=None,
+        entity_confidence=None, rag_confidence=None, needs_human_review=False,
+        human_review_reason=None, processing_time_ms=120, llm_provider="mock", asr_model="mock",
+    ))
+    assert len(logger.log_file.read_text(encoding="utf-8").splitlines()) == 3
+    logger.close()
+
+
+def test_audit_loggers_are_not_pinned_by_the_exit_hook(tmp_path):
+    import gc
+    import weakref
+
+    from elk.engine import analytics
+
+    logger = AuditLogger(log_dir=str(tmp_path))
+    logger.log_dict({"n": 1})
+    assert logger in analytics._open_loggers
+    log_file, ref = logger.log_file, weakref.ref(logger)
+
+    del logger
+    gc.collect()
+
+    assert ref() is None
+    assert json.loads(log_file.read_text(encoding="utf-8"))["n"] == 1
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import httpx
+
+from elk.connectors.mock_erp import MockERPConnector
+from elk.connectors.webhook import WebhookConnector
+from elk.core.config import settings
+
+
+def test_mock_erp_batches_concurrent_pushes(tmp_path):
+    """Concurrent pushes all succeed and land as whole JSONL lines."""
+    log_file = tmp_path / "events.jsonl"
+
+    async def push_many():
+        connector = MockERPConnector(log_file=str(log_file))
+        results = await asyncio.gather(
+            *(connector.push_incident({"seq": i}) for i in range(300))
+        )
+        await connector.close()
+        return results
+
+    assert all(asyncio.run(push_many()))
+    events = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert sorted(e["data"]["seq"] for e in events) == list(range(300))
+    assert events[0]["event"] == "INCIDENT_REPORT"
+
+
+def test_mock_erp_reports_write_failure(tmp_path):
+    async def push_one():
+        connector = MockERPConnector(log_file=str(tmp_path / "missing" / "events.jsonl"))
+        ok = await connector.push_incident({"seq": 0})
+        await connector.close()
+        return ok
+
+    assert asyncio.run(push_one()) is False
+
+
+def test_webhook_hedges_slow_attempt(monkeypatch):
+    """A stalled first POST is overtaken by the next attempt after one backoff step."""
+    monkeypatch.setattr(settings, "CONNECTOR_RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(settings, "CONNECTOR_MAX_RETRIES", 3)
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    async def push():
+        WebhookConnector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await asyncio.wait_for(
+                WebhookConnector("http://hooks.local/elk").push_incident({"job_id": "j1"}), timeout=2
+            )
+        finally:
+            await WebhookConnector.close()
+
+    assert asyncio.run(push()) is True
+    assert len(calls) == 2
+    # Both copies of the incident carry the same key for the receiver to dedupe on
+    assert [c.headers["Idempotency-Key"] for c in calls] == ["j1", "j1"]
+
+
+def test_webhook_is_the_only_retry_layer(monkeypatch):
+    """A failing target sees at most CONNECTOR_MAX_RETRIES POSTs per push."""
+    monkeypatch.setattr(settings, "CONNECTOR_RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(settings, "CONNECTOR_MAX_RETRIES", 3)
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async def push():
+        WebhookConnector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await WebhookConnector("http://hooks.local/elk").push_incident({"job_id": "j1"})
+        finally:
+            await WebhookConnector.close()
+
+    assert WebhookConnector.retries_internally is True
+    assert asyncio.run(push()) is False
+    assert len(calls) == 3
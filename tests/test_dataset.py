@@ -0,0 +1,20 @@
+import json
+
+from elk.training.dataset import TrainingDatabase
+
+
+def test_import_skips_only_the_bad_row_of_a_batch(tmp_path):
+    records = [
+        {"audio_hash": f"h{i}", "audio_path": f"a{i}.wav", "transcription": f"text {i}"}
+        for i in range(5)
+    ]
+    records.insert(3, {"audio_hash": "bad", "audio_path": "bad.wav", "transcription": None})
+    jsonl = tmp_path / "annotations.jsonl"
+    jsonl.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+
+    db = TrainingDatabase(str(tmp_path / "training.db"))
+    try:
+        assert db.import_from_jsonl(str(jsonl)) == 5
+        assert sorted(s.audio_hash for s in db.get_training_set()) == [f"h{i}" for i in range(5)]
+    finally:
+        db.conn.close()
@@ -0,0 +1,46 @@
+import asyncio
+
+from elk.api.limiter import RateLimiter, RedisRateLimiter
+
+
+def test_burst_capacity_then_limited():
+    """A client gets `capacity` requests, then is limited until refill."""
+    limiter = RateLimiter(rate=0.001, capacity=3)
+    assert [limiter.check_limit("10.0.0.1") for _ in range(4)] == [True, True, True, False]
+
+
+def test_buckets_are_per_client():
+    """Exhausting one client's bucket does not affect another client."""
+    limiter = RateLimiter(rate=0.001, capacity=1)
+    assert limiter.check_limit("10.0.0.1")
+    assert not limiter.check_limit("10.0.0.1")
+    assert limiter.check_limit("10.0.0.2")
+
+
+class FakeScript:
+    def __init__(self, allowed: int):
+        self.allowed = allowed
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.allowed
+
+
+class FakeRedis:
+    def __init__(self, allowed: int):
+        self.script = FakeScript(allowed)
+
+    def register_script(self, source):
+        return self.script
+
+
+def test_redis_limiter_uses_shared_bucket_key():
+    """The Redis limiter evaluates one script call keyed by client IP."""
+    limiter = RedisRateLimiter(rate=5.0, capacity=20)
+    redis = FakeRedis(allowed=0)
+
+    assert asyncio.run(limiter.check_limit(redis, "10.0.0.1")) is False
+    keys, args = redis.script.calls[0]
+    assert keys == ["rl:10.0.0.1"]
+    assert args[1:] == [5.0, 20, limiter.ttl_ms]
@@ -0,0 +1,172 @@
+import json
+
+from elk.engine.ai.llm import LLMClient
+
+
+class FakeProvider:
+    """Answers marshaled prompts; drops the last item for batches larger than 3."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt: str, system_prompt: str = "") -> str:
+        self.calls += 1
+        rows = [line for line in prompt.splitlines() if line.startswith("call-")]
+        answers = [{"echo": row} for row in rows]
+        if len(rows) == 1 and not prompt.startswith("Row"):
+            return json.dumps(answers[0])
+        if len(rows) > 3:
+            answers = answers[:-1]
+        return "```json\n" + json.dumps(answers) + "\n```"
+
+
+def test_generate_batch_keeps_order_and_splits_bad_marshals():
+    client = LLMClient(provider="gemini")
+    client._client = FakeProvider()
+    prompts = [f"call-{i}" for i in range(10)]
+
+    results = client.generate_batch(prompts, marshal_size=4, max_workers=2)
+
+    assert [r["echo"] for r in results] == prompts
+    # Two 4-row marshals were malformed and split into 2-row calls
+    assert client._client.calls == 3 + 4
+
+
+def test_generate_batch_caps_marshal_characters():
+    client = LLMClient(provider="gemini")
+    client._client = FakeProvider()
+    prompts = ["call-" + "x" * 30, "call-a", "call-b", "call-" + "y" * 40, "call-c"]
+
+    results = client.generate_batch(prompts, marshal_size=3, max_workers=1, max_chars=40)
+
+    assert [r["echo"] for r in results] == prompts
+    # 40-char budget: [long], [a, b], [longer], [c]
+    assert client._client.calls == 4
+
+
+def test_async_client_caps_concurrency_and_retries():
+    import asyncio
+
+    from elk.engine.ai.async_llm import AsyncLLMClient
+    from elk.engine.ai.llm import RetryConfig
+
+    client = AsyncLLMClient(
+        provider="ollama", max_concurrency=2,
+        retry_config=RetryConfig(max_retries=1, base_delay_seconds=0.0)
+    )
+    state = {"inflight": 0, "peak": 0, "flaky": 0}
+
+    async def fake_call(prompt, system_prompt):
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        await asyncio.sleep(0.01)
+        state["inflight"] -= 1
+        if prompt == "flaky" and state["flaky"] == 0:
+            state["flaky"] += 1
+            raise RuntimeError("transient")
+        return prompt.upper()
+
+    client._client._call_api = fake_call
+    results = asyncio.run(client.generate_many(["a", "b", "flaky", "c"]))
+
+    assert results == ["A", "B", "FLAKY", "C"]
+    assert state["peak"] == 2
+
+
+def test_response_cache_skips_repeated_calls():
+    client = LLMClient(provider="gemini", cache=True, cache_size=2)
+    client._client = FakeProvider()
+
+    first = client.extract_json("call-a")
+    first["mutated"] = True
+    assert client.extract_json("call-a") == {"echo": "call-a"}
+    assert client._client.calls == 1
+
+    client.extract_json("call-b")
+    client.extract_json("call-c")
+    client.extract_json("call-a")  # evicted by the two newer prompts
+    assert client._client.calls == 4
+
+
+def test_ollama_client_posts_json_over_pooled_httpx():
+    import httpx
+
+    client = LLMClient(provider="ollama")
+
+    def handler(request):
+        assert request.url.path == "/api/generate"
+        assert request.headers["content-type"] == "application/json"
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"response": body["prompt"].upper()})
+
+    client._client._session._transport = httpx.MockTransport(handler)
+    assert client.generate("appel") == "APPEL"
+    client.close()
+
+
+def test_generate_structured_validates_with_cached_adapter():
+    from pydantic import BaseModel
+
+    from elk.engine.ai.llm import _type_adapter
+
+    class Incident(BaseModel):
+        echo: str
+        urgency: str = "high"
+
+    client = LLMClient(provider="gemini")
+    client._client = FakeProvider()
+
+    assert client.generate_structured("sys", "call-x", Incident) == {"echo": "call-x", "urgency": "high"}
+    assert client.generate_structured("sys", "call-y", Incident)["echo"] == "call-y"
+    assert _type_adapter.cache_info().hits >= 1
+
+
+def test_parse_json_response_finds_json_inside_prose():
+    parse = LLMClient._parse_json_response
+
+    assert parse('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse('Voici [la reponse]: {"incident": {"type": "fire"}} merci') == {"incident": {"type": "fire"}}
+    try:
+        parse("no json here")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_generate_batch_returns_none_for_rows_that_fail():
+    class Flaky(FakeProvider):
+        def generate(self, prompt, system_prompt=""):
+            if "call-bad" in prompt:
+                self.calls += 1
+                return "not json"
+            if "call-down" in prompt:
+                self.calls += 1
+                raise ConnectionError("provider down")
+            return super().generate(prompt, system_prompt)
+
+    client = LLMClient(provider="gemini")
+    client._client = Flaky()
+    prompts = ["call-a", "call-b", "call-c", "call-bad", "call-down", "call-e"]
+
+    results = client.generate_batch(prompts, marshal_size=4, max_workers=1)
+
+    assert results[:3] == [{"echo": "call-a"}, {"echo": "call-b"}, {"echo": "call-c"}]
+    # The bad row fails alone after splitting; the failing call takes its marshal down
+    assert results[3:] == [None, None, None]
+
+
+def test_generate_batch_raises_configuration_errors_without_splitting():
+    import pytest
+
+    class Unconfigured(FakeProvider):
+        def generate(self, prompt, system_prompt=""):
+            self.calls += 1
+            raise ValueError("GEMINI_API_KEY required")
+
+    client = LLMClient(provider="gemini")
+    client._client = Unconfigured()
+
+    with pytest.raises(ValueError, match="GEMINI_API_KEY"):
+        client.generate_batch([f"call-{i}" for i in range(8)], marshal_size=8, max_workers=1)
+    assert client._client.calls == 1
@@ -0,0 +1,65 @@
+import json
+
+from elk.api.middleware import MetricsCollector, StructuredLogger
+
+
+def test_structured_logger_batches_and_flushes(tmp_path):
+    """Queued records land in the daily JSONL files after flush()."""
+    log = StructuredLogger(log_dir=str(tmp_path))
+    for i in range(50):
+        log.log_request({"path": "/jobs", "seq": i})
+    log.log_error({"path": "/jobs", "status_code": 500})
+
+    log.flush()
+
+    lines = log.request_log.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == list(range(50))
+    assert json.loads(log.error_log.read_text(encoding="utf-8"))["status_code"] == 500
+    log.close()
+
+
+def test_structured_logger_rotates_at_midnight(tmp_path):
+    """Crossing the rotation deadline switches files and closes stale handles."""
+    log = StructuredLogger(log_dir=str(tmp_path))
+    today_log = log.request_log
+    log.request_log = tmp_path / "requests_1999-12-31.jsonl"
+    log.log_request({"seq": 0})
+    log.flush()
+    assert log.request_log in log._files
+
+    log._rotate_at = 0.0
+    log.log_request({"seq": 1})
+    log.flush()
+
+    assert log.request_log == today_log
+    assert tmp_path / "requests_1999-12-31.jsonl" not in log._files
+    assert json.loads(today_log.read_text(encoding="utf-8"))["seq"] == 1
+    log.close()
+
+
+def test_metrics_latency_percentiles():
+    """Percentiles are computed over the rolling latency window."""
+    collector = MetricsCollector()
+    assert collector.get_metrics()["p95_latency_ms"] == 0.0
+
+    for latency in range(1, 101):
+        collector.record_request(success=latency % 10 != 0, latency_ms=float(latency))
+
+    data = collector.get_metrics()
+    assert data["total_requests"] == 100
+    assert data["failed_requests"] == 10
+    assert data["min_latency_ms"] == 1.0
+    assert data["max_latency_ms"] == 100.0
+    assert data["p50_latency_ms"] == 50.0
+    assert data["p95_latency_ms"] == 95.0
+
+
+def test_metrics_snapshot_is_cached():
+    """Serialized metrics are reused until the snapshot TTL expires."""
+    collector = MetricsCollector()
+    first = collector.get_metrics_bytes()
+    collector.record_request(success=True, latency_ms=12.0)
+
+    assert collector.get_metrics_bytes() is first
+    collector.SNAPSHOT_TTL_S = 0.0
+    assert json.loads(collector.get_metrics_bytes())["total_requests"] == 1
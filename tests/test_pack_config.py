@@ -0,0 +1,71 @@
+import os
+
+from elk.factory.config import PackConfig, load_pack_config
+
+
+def test_get_walks_dot_paths_through_the_flat_index(tmp_path):
+    (tmp_path / "config.yaml").write_text(
+        "llm:\n  provider: ollama\n  local:\n    model: llama3\nasr:\n  model: null\n"
+    )
+    config = PackConfig(tmp_path)
+
+    assert config.get("llm.local.model") == "llama3"
+    assert config.get("llm.local") == {"model": "llama3"}
+    assert config.get("llm.provider.name", "x") == "x"
+    assert config.get("asr.model", "base") == "base"
+    assert config.get("missing", 1) == 1
+
+
+def test_load_pack_config_reuses_config_until_a_file_changes(tmp_path, monkeypatch):
+    pack = tmp_path / "demo_pack"
+    pack.mkdir()
+    config_file = pack / "config.yaml"
+    config_file.write_text("pack:\n  name: demo\n")
+    monkeypatch.setenv("ELK_PACKS_DIR", str(tmp_path))
+
+    first = load_pack_config("demo-pack")
+    assert load_pack_config("demo-pack") is first
+
+    config_file.write_text("pack:\n  name: renamed\n")
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = load_pack_config("demo-pack")
+    assert reloaded is not first
+    assert reloaded.pack_name == "renamed"
+
+
+def test_env_placeholders_are_expanded_throughout_the_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("ELK_TEST_MODEL", "mistral")
+    monkeypatch.delenv("ELK_TEST_UNSET", raising=False)
+    (tmp_path / "config.yaml").write_text(
+        "llm:\n"
+        "  local:\n"
+        "    model: ${ELK_TEST_MODEL}\n"
+        "    base_url: http://${ELK_TEST_UNSET:-localhost}:11434\n"
+        "  keys: ['${ELK_TEST_UNSET}', '${ELK_TEST_UNSET:-}']\n"
+        "  retries: 3\n"
+    )
+    config = PackConfig(tmp_path)
+
+    assert config.get("llm.local.model") == "mistral"
+    assert config.get("llm.local.base_url") == "http://localhost:11434"
+    assert config.get("llm.keys") == ["${ELK_TEST_UNSET}", ""]
+    assert config.get("llm.retries") == 3
+
+
+def test_yaml_sidecar_is_invalidated_by_an_older_replacement(tmp_path):
+    from elk.factory.config import load_yaml_cached
+
+    path = tmp_path / "rules.yaml"
+    path.write_text("rules: [new]\n")
+    assert load_yaml_cached(path) == {"rules": ["new"]}
+    assert (tmp_path / "rules.yaml.cache.json").exists()
+
+    # e.g. `cp -p` / `tar -x` of an older file: the mtime goes backwards
+    path.write_text("rules: [older]\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+
+    assert load_yaml_cached(path) == {"rules": ["older"]}
+    assert load_yaml_cached(path) == {"rules": ["older"]}
@@ -0,0 +1,215 @@
+import pytest
+
+import elk.engine.rag.vector_store as vector_store
+from elk.engine.rag import HybridRAG
+
+
+def _rag():
+    rag = HybridRAG(vector_store=None)
+    rag.load_pack_knowledge(
+        communes=["Bejaia", "Akbou", "Amizour"],
+        quartiers=["Ihaddaden", "Akbou"],
+        vocab={"times": "feu", "aman": "eau"},
+    )
+    return rag
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_keyword_search_reports_each_term_once_in_pack_order(monkeypatch, use_automaton):
+    if use_automaton:
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(vector_store, "ahocorasick", None)
+    rag = _rag()
+
+    results = rag.keyword_search("Times g Akbou, times ar Ihaddaden, akbou")
+
+    assert [(r.metadata["type"], r.metadata.get("name", r.metadata.get("kabyle"))) for r in results] == [
+        ("commune", "akbou"), ("quartier", "ihaddaden"), ("quartier", "akbou"), ("vocab", "times"),
+    ]
+
+
+def test_reloading_knowledge_invalidates_cached_matches():
+    rag = _rag()
+    assert rag.keyword_search("aman deg Amizour")
+
+    rag.load_pack_knowledge(communes=["Tichy"], quartiers=[], vocab={})
+    assert rag.keyword_search("aman deg Amizour") == []
+
+
+class FakeCollection:
+    def __init__(self):
+        self.queries = []
+
+    def count(self):
+        return 2
+
+    def add(self, **kwargs):
+        pass
+
+    def get(self, include):
+        return {"ids": []}
+
+    def query(self, query_embeddings, n_results, where, include):
+        self.queries.append(query_embeddings)
+        return {
+            "documents": [["Commune de Bejaia: Akbou"]],
+            "distances": [[0.2]],
+            "metadatas": [[{"type": "commune"}]],
+        }
+
+
+def _vector_store():
+    from collections import OrderedDict
+
+    store = vector_store.VectorStore.__new__(vector_store.VectorStore)
+    store.collection = FakeCollection()
+    store.embedded = []
+    store._embedder = lambda texts: store.embedded.extend(texts) or [[0.1, 0.2]]
+    store._embeddings, store._hits = OrderedDict(), OrderedDict()
+    store._doc_count = store.collection.count()
+    store.persist_path, store.collection_name = None, "test"
+    return store
+
+
+def test_vector_query_reuses_embeddings_and_hits_until_new_documents():
+    pytest.importorskip("numpy")  # int8 embedding cache; chromadb itself requires numpy
+    store = _vector_store()
+
+    first = store.query("times g akbou", n_results=1)
+    first[0].score = 0.0  # HybridRAG reweights results in place
+    second = store.query("times g akbou", n_results=1)
+
+    assert second[0].score == pytest.approx(0.9)
+    assert store.embedded == ["times g akbou"]
+    assert len(store.collection.queries) == 1
+
+    store.add_documents(["Quartier: Ihaddaden"])
+    store.query("times g akbou", n_results=1)
+    assert store.embedded == ["times g akbou"]
+    assert len(store.collection.queries) == 2
+
+
+def test_index_lexicon_embeds_in_batches():
+    store = _vector_store()
+    store.INDEX_BATCH_SIZE = 2
+    added = []
+    store.collection.upsert = lambda **kwargs: added.append(kwargs)
+    store._embedder = lambda texts: [[float(len(t))] for t in texts]
+
+    count = store.index_lexicon(["Akbou", "Amizour"], ["Ihaddaden"], {"times": "feu"})
+
+    assert count == 4
+    assert [batch["ids"] for batch in added] == [["commune_0", "commune_1"], ["quartier_0", "vocab_0"]]
+    assert added[1]["metadatas"][1] == {"type": "vocab", "kabyle": "times", "french": "feu"}
+    assert all(len(b["embeddings"]) == len(b["documents"]) for b in added)
+
+
+def test_vector_rerank_orders_candidates_by_cosine():
+    pytest.importorskip("numpy")
+    store = _vector_store()
+
+    ranked = store.rerank([1.0, 0.0], [[0.0, 1.0], [1.0, 0.1], [0.0, 0.0], [2.0, 0.0]], top_k=3)
+
+    assert [i for i, _ in ranked] == [3, 1, 0]
+    assert ranked[0][1] == pytest.approx(1.0)
+
+
+def test_int8_rerank_matches_float_order():
+    pytest.importorskip("numpy")
+    store = _vector_store()
+    docs = [[0.1, 0.9, 0.3], [0.8, 0.2, 0.1], [0.5, 0.5, 0.5]]
+
+    exact = store.rerank([1.0, 0.1, 0.2], docs)
+    quantized = store.rerank([1.0, 0.1, 0.2], docs, int8=True)
+
+    assert [i for i, _ in quantized] == [i for i, _ in exact]
+    assert quantized[0][1] == pytest.approx(exact[0][1], abs=0.01)
+
+
+def test_hybrid_search_keeps_best_score_per_prefix():
+    rag = _rag()
+    rag.vector_store = _vector_store()
+    rag.vector_store.query = lambda query, n_results: [
+        vector_store.RAGResult("DETECTED_LOCATION: Akbou (Commune de Bejaia)", 0.95, {}, "vector"),
+        vector_store.RAGResult("Commune de Bejaia: Amizour", 0.5, {}, "vector"),
+    ]
+
+    results, context = rag.search("times g akbou", n_results=2)
+
+    # The vector hit on the commune outranks and replaces the keyword one
+    assert [r.source for r in results] == ["vector", "keyword"]
+    assert context.splitlines() == [results[0].text, "DETECTED_LANDMARK: Akbou (Quartier connu)"]
+    assert results[0].score == pytest.approx(0.95 * rag.vector_weight)
+
+
+def test_index_lexicon_skips_unchanged_persisted_lexicon(tmp_path):
+    store = _vector_store()
+    store.persist_path = str(tmp_path)
+    added = []
+    store.collection.upsert = lambda **kwargs: added.append(kwargs)
+    store._embedder = lambda texts: [[1.0] for _ in texts]
+
+    assert store.index_lexicon(["Akbou"], [], {"times": "feu"}) == 2
+    assert store.index_lexicon(["Akbou"], [], {"times": "feu"}) == 0
+    assert store.index_lexicon(["Akbou", "Tichy"], [], {"times": "feu"}) == 3
+    assert len(added) == 2
+
+
+class MemoryCollection:
+    """Chroma-like id semantics: add() ignores existing ids, upsert() replaces them."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def count(self):
+        return len(self.docs)
+
+    def add(self, ids, documents, **kwargs):
+        for doc_id, doc in zip(ids, documents):
+            self.docs.setdefault(doc_id, doc)
+
+    def upsert(self, ids, documents, **kwargs):
+        self.docs.update(zip(ids, documents))
+
+    def get(self, include):
+        return {"ids": list(self.docs)}
+
+    def delete(self, ids):
+        for doc_id in ids:
+            del self.docs[doc_id]
+
+
+def test_changed_lexicon_replaces_persisted_documents(tmp_path):
+    store = _vector_store()
+    store.collection = MemoryCollection()
+    store.persist_path = str(tmp_path)
+    store._embedder = lambda texts: [[1.0] for _ in texts]
+    store.add_documents(["Protocole incendie"], ids=["doc_0"])
+
+    store.index_lexicon(["Akbou", "Tichy"], ["Ihaddaden"], {"times": "feu"})
+    assert store.index_lexicon(["Amizour"], [], {"aman": "eau"}) == 2
+
+    assert store.collection.docs == {
+        "doc_0": "Protocole incendie",
+        "commune_0": "Commune de Bejaia: Amizour",
+        "vocab_0": "Vocabulaire Kabyle: aman signifie eau",
+    }
+    assert store._doc_count == 3
+    assert store.index_lexicon(["Amizour"], [], {"aman": "eau"}) == 0
+
+
+def test_generated_document_ids_survive_lexicon_shrinking(tmp_path):
+    store = _vector_store()
+    store.collection = MemoryCollection()
+    store.persist_path = str(tmp_path)
+    store._embedder = lambda texts: [[1.0] for _ in texts]
+
+    store.index_lexicon(["Akbou", "Tichy", "Amizour"], [], {})
+    store.add_documents(["Protocole incendie", "Protocole inondation"])
+    store.index_lexicon(["Akbou"], [], {})
+    # The count is back to 3: a count-based id would reuse the first document's
+    store.add_documents(["Protocole noyade"])
+
+    docs = sorted(d for i, d in store.collection.docs.items() if i.startswith("doc_"))
+    assert docs == ["Protocole incendie", "Protocole inondation", "Protocole noyade"]
@@ -0,0 +1,214 @@
+import pytest
+
+from elk.engine.rag.reranker import CrossEncoderReranker, RankedResult
+
+
+class FakeCrossEncoder:
+    """Scores a pair by document length and records each batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.batches.append([doc for _, doc in pairs])
+        return [len(doc) / 100 for _, doc in pairs]
+
+
+def test_rerank_batches_by_length_and_keeps_scores_aligned():
+    reranker = CrossEncoderReranker(batch_size=2)
+    reranker._model = FakeCrossEncoder()
+    docs = ["x" * n for n in (40, 5, 30, 10, 20)]
+    results = [RankedResult(document=d, metadata={"n": len(d)}, original_score=0.0) for d in docs]
+
+    ranked = reranker.rerank_with_metadata("feu", results, top_n=3)
+
+    assert reranker._model.batches == [["x" * 5, "x" * 10], ["x" * 20, "x" * 30], ["x" * 40]]
+    assert [r.metadata["n"] for r in ranked] == [40, 30, 20]
+    assert all(r.rerank_score == r.metadata["n"] / 100 for r in results)
+
+
+def test_onnx_backend_falls_back_when_runtime_missing(monkeypatch):
+    import sys
+    import elk.engine.rag.reranker as reranker_module
+
+    monkeypatch.setitem(sys.modules, "onnxruntime", None)
+    fake = FakeCrossEncoder()
+
+    class FakeSentenceTransformers:
+        @staticmethod
+        def CrossEncoder(name, device=None):
+            return fake
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", FakeSentenceTransformers)
+    monkeypatch.setenv("ELK_RERANK_BACKEND", "onnx")
+
+    reranker = reranker_module.CrossEncoderReranker()
+    assert reranker.backend == "onnx"
+    assert reranker._load_model() is fake
+
+
+def test_pipeline_prefilters_candidates_by_original_score(monkeypatch):
+    import elk.engine.rag.reranker as reranker_module
+
+    fake = FakeCrossEncoder()
+    monkeypatch.setattr(reranker_module.CrossEncoderReranker, "_load_model", lambda self: fake)
+    pipeline = reranker_module.create_reranking_pipeline(min_score=0.0, pre_filter_k=4)
+    results = [RankedResult(document="x" * n, metadata={}, original_score=n) for n in range(10)]
+
+    ranked = pipeline("feu", results, top_n=1)
+
+    scored = [doc for batch in fake.batches for doc in batch]
+    assert sorted(len(doc) for doc in scored) == [6, 7, 8, 9]
+    assert len(ranked[0].document) == 9
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with fixed special ids; counts calls per text."""
+
+    cls_token_id, sep_token_id, pad_token_id = 1, 2, 0
+
+    def __init__(self):
+        self.vocab = {}
+        self.calls = {}
+
+    def __call__(self, text, add_special_tokens=False, truncation=True, max_length=None):
+        assert not add_special_tokens
+        self.calls[text] = self.calls.get(text, 0) + 1
+        ids = [self.vocab.setdefault(word, 10 + len(self.vocab)) for word in text.split()]
+        return {"input_ids": ids[:max_length] if truncation else ids}
+
+
+class StubSession:
+    """Records feeds and answers with fixed logits (zeros by default)."""
+
+    def __init__(self, logits=None):
+        self.feeds = []
+        self.logits = logits
+
+    def run(self, outputs, feeds):
+        import numpy as np
+
+        self.feeds.append(feeds)
+        if self.logits is not None:
+            return [np.asarray(self.logits, dtype=np.float32)]
+        return [np.zeros((len(feeds["input_ids"]), 1), dtype=np.float32)]
+
+
+def _onnx_encoder(max_length, token_cache_size=100):
+    from collections import OrderedDict
+
+    from elk.engine.rag.reranker import OnnxCrossEncoder
+
+    encoder = OnnxCrossEncoder.__new__(OnnxCrossEncoder)
+    encoder.tokenizer = StubTokenizer()
+    encoder.session = StubSession()
+    encoder.input_names = {"input_ids", "attention_mask", "token_type_ids"}
+    encoder.max_length = max_length
+    encoder.token_cache_size = token_cache_size
+    encoder._doc_tokens = OrderedDict()
+    encoder._pair_layout = True
+    return encoder
+
+
+def test_onnx_pair_rows_match_bert_pair_encoding():
+    pytest.importorskip("numpy")
+    encoder = _onnx_encoder(max_length=8)
+    docs = ["incendie a akbou", "feu", "un deux trois quatre cinq six"]
+
+    encoder.predict([("feu akbou", d) for d in docs])
+
+    feeds = encoder.session.feeds[0]
+    feu, akbou, incendie, a = 10, 11, 12, 13
+    un, deux, trois = 14, 15, 16
+    assert feeds["input_ids"].tolist() == [
+        [1, feu, akbou, 2, incendie, a, akbou, 2],
+        [1, feu, akbou, 2, feu, 2, 0, 0],
+        # Query keeps its half of max_length; the document is cut to fit
+        [1, feu, akbou, 2, un, deux, trois, 2],
+    ]
+    assert feeds["attention_mask"].tolist() == [[1] * 8, [1] * 6 + [0] * 2, [1] * 8]
+    assert feeds["token_type_ids"].tolist() == [
+        [0, 0, 0, 0, 1, 1, 1, 1],
+        [0, 0, 0, 0, 1, 1, 0, 0],
+        [0, 0, 0, 0, 1, 1, 1, 1],
+    ]
+
+
+def test_onnx_documents_are_tokenized_once_across_calls():
+    pytest.importorskip("numpy")
+    encoder = _onnx_encoder(max_length=32)
+    docs = ["incendie a akbou", "feu de foret"]
+
+    encoder.predict([("feu", d) for d in docs])
+    encoder.predict([("fuite de gaz", d) for d in docs])
+
+    assert [encoder.tokenizer.calls[d] for d in docs] == [1, 1]
+    assert encoder.tokenizer.calls["feu"] == 1
+
+
+def test_onnx_document_token_cache_evicts_least_recently_used():
+    pytest.importorskip("numpy")
+    encoder = _onnx_encoder(max_length=32, token_cache_size=2)
+
+    encoder.predict([("feu", "a"), ("feu", "b")])
+    encoder.predict([("feu", "a"), ("feu", "c")])  # "b" is now the oldest entry
+    encoder.predict([("feu", "a")])
+
+    assert encoder.tokenizer.calls == {"feu": 3, "a": 1, "b": 1, "c": 1}
+    assert len(encoder._doc_tokens) == 2
+
+
+def test_onnx_scores_match_cross_encoder_sigmoid_scale():
+    """Single-logit ONNX outputs get CrossEncoder.predict's sigmoid, so both backends agree."""
+    pytest.importorskip("numpy")
+    import math
+
+    logits = [2.0, -1.0, 0.0]
+    encoder = _onnx_encoder(max_length=16)
+    encoder.session = StubSession([[x] for x in logits])
+
+    class TorchCrossEncoder:
+        """What sentence-transformers returns for a single-label model: sigmoid(logit)."""
+
+        def predict(self, pairs, batch_size=32, show_progress_bar=False):
+            return [1 / (1 + math.exp(-x)) for x in logits[:len(pairs)]]
+
+    pairs = [("feu", d) for d in ("a", "b", "c")]
+    assert encoder.predict(pairs) == pytest.approx(TorchCrossEncoder().predict(pairs))
+
+    onnx_backend, torch_backend = CrossEncoderReranker(), CrossEncoderReranker()
+    onnx_backend._model, torch_backend._model = encoder, TorchCrossEncoder()
+    docs = ["a", "b", "c"]
+    assert [r.rerank_score for r in onnx_backend.rerank_with_metadata(
+        "feu", [RankedResult(d, {}, 0.0) for d in docs], top_n=3
+    )] == pytest.approx([r.rerank_score for r in torch_backend.rerank_with_metadata(
+        "feu", [RankedResult(d, {}, 0.0) for d in docs], top_n=3
+    )])
+
+
+def test_onnx_pair_layout_requires_token_type_ids(monkeypatch):
+    """RoBERTa-style exports (no token_type_ids input) use the tokenizer's own pair encoding."""
+    import sys
+    import types
+
+    from elk.engine.rag.reranker import OnnxCrossEncoder
+
+    def fake_runtime(input_names):
+        session = types.SimpleNamespace(
+            get_inputs=lambda: [types.SimpleNamespace(name=n) for n in input_names]
+        )
+        return types.SimpleNamespace(InferenceSession=lambda path, providers: session)
+
+    transformers = types.SimpleNamespace(
+        AutoTokenizer=types.SimpleNamespace(from_pretrained=lambda name: StubTokenizer())
+    )
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+    monkeypatch.setattr(OnnxCrossEncoder, "_quantized_model", staticmethod(lambda name: "model.onnx"))
+
+    monkeypatch.setitem(sys.modules, "onnxruntime", fake_runtime(["input_ids", "attention_mask"]))
+    assert OnnxCrossEncoder("roberta")._pair_layout is False
+
+    monkeypatch.setitem(
+        sys.modules, "onnxruntime", fake_runtime(["input_ids", "attention_mask", "token_type_ids"])
+    )
+    assert OnnxCrossEncoder("bert")._pair_layout is True
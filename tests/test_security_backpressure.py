@@ -64,3 +64,44 @@ def test_queue_backpressure_returns_429(audio_payload):
         headers=headers,
     )
     assert response.status_code == 429
+
+
+def test_invalid_base64_returns_400():
+    client = _prepare_client(redis_depth=0)
+    headers = {"X-API-Key": settings.API_KEY}
+    response = client.post(
+        "/jobs",
+        json={"audio_base64": "not-base64!!", "language_hint": "kab"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+def test_bearer_token_accepted(audio_payload):
+    client = _prepare_client(redis_depth=5)
+    headers = {"Authorization": f"Bearer {settings.API_KEY}"}
+    response = client.post(
+        "/jobs",
+        json={"audio_base64": audio_payload, "language_hint": "kab"},
+        headers=headers,
+    )
+    # Past auth, so the backpressure check answers
+    assert response.status_code == 429
+
+
+def test_cleanup_removes_only_expired_uploads(tmp_path, monkeypatch):
+    from elk.api import routes
+
+    monkeypatch.setattr(routes, "_UPLOAD_TTL_SEEDED", True)
+    monkeypatch.setattr(routes, "_UPLOAD_TTL_QUEUE", routes.deque())
+    expired, fresh = tmp_path / "old.wav", tmp_path / "new.wav"
+    expired.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    now = routes.time.monotonic_ns()
+    routes._UPLOAD_TTL_QUEUE.extend([(now - 1, str(expired)), (now + 10**12, str(fresh))])
+
+    routes._cleanup_old_uploads()
+
+    assert not expired.exists()
+    assert fresh.exists()
+    assert len(routes._UPLOAD_TTL_QUEUE) == 1